@@ -7,6 +7,8 @@ from pathlib import Path
 REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
 REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
 REDIS_URL = f"redis://{REDIS_HOST}:{REDIS_PORT}"
+REDIS_POOL_SIZE = int(os.getenv("REDIS_POOL_SIZE", "8"))  # WORKER_CONCURRENCY * 2
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "2"))
 
 # NATS configuration
 NATS_URL = os.getenv("NATS_URL", "nats://localhost:4222")
@@ -17,6 +19,7 @@ WORKSPACE_DIR = Path(os.getenv("CLONE_WORKSPACE_DIR", "/tmp/ai-docgap/clones"))
 # Rate limiting configuration
 MAX_ATTEMPTS_PER_DOMAIN = int(os.getenv("MAX_ATTEMPTS_PER_DOMAIN", "3"))
 BASE_BACKOFF_SECONDS = int(os.getenv("BASE_BACKOFF_SECONDS", "2"))
+WINDOW_SECONDS = int(os.getenv("RATE_LIMIT_WINDOW_SECONDS", "3600"))  # Rolling window
 
 # Clone configuration
 DEFAULT_CLONE_DEPTH = int(os.getenv("DEFAULT_CLONE_DEPTH", "1"))
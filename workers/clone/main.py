@@ -10,66 +10,72 @@ Features:
 - Sparse checkout for monorepos
 - Git LFS support for images/screens
 - Per-project queuing
-- Rate limiting with exponential backoff
+- Rolling-window rate limiting per domain
 - Error handling and retries
 """
 
 import asyncio
-import json
+import functools
+import hashlib
 import logging
 import os
+import secrets
 import shutil
-import subprocess
 import sys
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-from urllib.parse import urlparse
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
 
-import aiofiles
-import httpx
+import msgspec
+import orjson
 from nats.aio.client import Client as NATS
-from nats.aio.errors import ErrTimeout
 import redis.asyncio as redis
 import structlog
 
-# Configure structured logging
-structlog.configure(
-    processors=[
-        structlog.stdlib.filter_by_level,
-        structlog.stdlib.add_logger_name,
-        structlog.stdlib.add_log_level,
-        structlog.stdlib.PositionalArgumentsFormatter(),
-        structlog.processors.TimeStamper(fmt="iso"),
+from messages import CloneRequest, CloneResultMessage, REQUEST_DECODER, RESULT_ENCODER
+
+# Configure structured logging. Calls below LOG_LEVEL are dropped by the
+# bound logger before any processor runs; exception/stack rendering is only
+# wired in at DEBUG
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
+_log_processors: List[Any] = [
+    structlog.processors.add_log_level,
+    structlog.processors.TimeStamper(fmt="iso"),
+]
+if LOG_LEVEL == "DEBUG":
+    _log_processors += [
         structlog.processors.StackInfoRenderer(),
         structlog.processors.format_exc_info,
-        structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer()
-    ],
+    ]
+_log_processors.append(structlog.processors.JSONRenderer(serializer=orjson.dumps))
+
+structlog.configure(
+    processors=_log_processors,
     context_class=dict,
-    logger_factory=structlog.stdlib.LoggerFactory(),
-    wrapper_class=structlog.stdlib.BoundLogger,
+    logger_factory=structlog.BytesLoggerFactory(),
+    wrapper_class=structlog.make_filtering_bound_logger(
+        getattr(logging, LOG_LEVEL, logging.INFO)
+    ),
     cache_logger_on_first_use=True,
 )
 
 logger = structlog.get_logger()
 
 
-@dataclass
-class CloneRequest:
-    """Clone request data structure"""
-    project_id: str
-    repo_url: str
-    branch: str = "main"
-    depth: int = 1
-    sparse_paths: Optional[List[str]] = None
-    include_lfs: bool = True
-    priority: int = 0
-    request_id: str = ""
+CLONE_SUBJECT = "repo.clone"
+PRIORITY_LEVELS = 3
+
+
+def clone_subject(priority: int) -> str:
+    """NATS subject a clone request of the given priority is published to"""
+    return f"{CLONE_SUBJECT}.p{max(0, min(priority, PRIORITY_LEVELS - 1))}"
 
 
-@dataclass
+@dataclass(slots=True)
 class CloneResult:
     """Clone result data structure"""
     project_id: str
@@ -83,25 +89,59 @@ class CloneResult:
 
 
 class RateLimiter:
-    """Rate limiter with exponential backoff"""
-
-    def __init__(self, redis_client: redis.Redis, max_attempts: int = 3):
+    """Rolling-window rate limiter backed by a Redis sorted set per domain"""
+
+    # Drop failures outside the window and compare the remainder against the
+    # limit; when blocked, also return the oldest failure's timestamp
+    CHECK_SCRIPT = """
+    redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', '(' .. (tonumber(ARGV[1]) - tonumber(ARGV[2])))
+    local count = redis.call('ZCARD', KEYS[1])
+    if count >= tonumber(ARGV[3]) then
+        local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+        return {0, oldest[2], count}
+    end
+    return {1, '0', count}
+    """
+
+    # Record a failure and extend the key's TTL so idle domains expire
+    RECORD_FAILURE_SCRIPT = """
+    redis.call('ZADD', KEYS[1], ARGV[1], ARGV[2])
+    redis.call('EXPIRE', KEYS[1], tonumber(ARGV[3]))
+    return 1
+    """
+
+    def __init__(self, redis_client: redis.Redis, max_attempts: int = 3,
+                 window_seconds: int = 3600) -> None:
         self.redis = redis_client
         self.max_attempts = max_attempts
+        self.window_seconds = window_seconds
+        # Registered scripts cache their SHA and are invoked via EVALSHA
+        self._check_script = redis_client.register_script(self.CHECK_SCRIPT)
+        self._record_failure_script = redis_client.register_script(
+            self.RECORD_FAILURE_SCRIPT
+        )
 
     async def check_rate_limit(self, domain: str) -> Tuple[bool, float]:
         """Check if domain is rate limited. Returns (allowed, wait_time)"""
+        allowed, wait_time, _ = await self.check_window(domain)
+        return allowed, wait_time
+
+    async def check_window(self, domain: str) -> Tuple[bool, float, int]:
+        """Check the rolling window in one round trip. Returns (allowed, wait_time, failures)"""
         key = f"ratelimit:{domain}"
-        attempts = await self.redis.get(key)
+        now = time.time()
+        allowed, oldest, failures = await self._check_script(
+            keys=[key], args=[now, self.window_seconds, self.max_attempts]
+        )
 
-        if attempts and int(attempts) >= self.max_attempts:
-            # Calculate backoff time (exponential)
-            wait_time = 2 ** (int(attempts) - self.max_attempts)
-            return False, wait_time
+        if not int(allowed):
+            # Wait until the oldest failure slides out of the window
+            wait_time = max(0.0, self.window_seconds - (now - float(oldest)))
+            return False, wait_time, int(failures)
 
-        return True, 0.0
+        return True, 0.0, int(failures)
 
-    async def record_attempt(self, domain: str, success: bool):
+    async def record_attempt(self, domain: str, success: bool, request_id: str = "") -> None:
         """Record an attempt for rate limiting"""
         key = f"ratelimit:{domain}"
 
@@ -109,58 +149,123 @@ class RateLimiter:
             # Reset on success
             await self.redis.delete(key)
         else:
-            # Increment failure count with expiry
-            await self.redis.incr(key)
-            await self.redis.expire(key, 3600)  # 1 hour expiry
+            # Add the failure to the rolling window
+            member = request_id or secrets.token_hex(4)
+            await self._record_failure_script(
+                keys=[key], args=[time.time(), member, self.window_seconds]
+            )
 
 
 class GitCloneManager:
     """Manages Git cloning operations"""
 
-    def __init__(self, workspace_dir: Path, rate_limiter: RateLimiter):
+    def __init__(self, workspace_dir: Path, rate_limiter: RateLimiter,
+                 clone_timeout: float = 300) -> None:
+        # Created lazily, along with each clone's parent directories
         self.workspace_dir = workspace_dir
         self.rate_limiter = rate_limiter
-        self.workspace_dir.mkdir(exist_ok=True)
+        self.clone_timeout = clone_timeout
+        self._lfs_available: Optional[bool] = None
+        self._git_env = self._build_git_env()
+        # Dedicated pool so filesystem calls don't compete with the default executor
+        self._fs_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="clone-fs")
+
+    @staticmethod
+    def _build_git_env() -> Dict[str, str]:
+        """Build the environment shared by every git invocation"""
+        git_config = [
+            ("protocol.version", "2"),
+            ("core.fsmonitor", "false"),
+            ("gc.auto", "0"),
+            ("core.preloadindex", "true"),
+            ("pack.threads", "0"),
+        ]
+        env = {**os.environ, "GIT_CONFIG_COUNT": str(len(git_config))}
+        for i, (key, value) in enumerate(git_config):
+            env[f"GIT_CONFIG_KEY_{i}"] = key
+            env[f"GIT_CONFIG_VALUE_{i}"] = value
+
+        # Never let git block waiting for credentials; fail fast instead
+        env["GIT_TERMINAL_PROMPT"] = "0"
+        env["GIT_ASKPASS"] = "/bin/true"
+        return env
+
+    async def _run_fs(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking filesystem call off the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._fs_pool, functools.partial(func, *args, **kwargs)
+        )
+
+    def close(self) -> None:
+        """Release the filesystem thread pool"""
+        self._fs_pool.shutdown(wait=False)
 
     def get_local_path(self, project_id: str, repo_url: str) -> Path:
-        """Generate local path for repository"""
-        domain = urlparse(repo_url).netloc
-        repo_name = Path(repo_url).stem
-        return self.workspace_dir / domain / project_id / repo_name
+        """Generate local path for repository, sharded by hash prefix"""
+        digest = hashlib.blake2b(
+            f"{project_id}|{repo_url}".encode(), digest_size=8
+        ).hexdigest()
+        return self.workspace_dir / digest[:2] / digest[2:4] / digest
+
+    def _write_metadata(self, local_path: Path, request: CloneRequest) -> None:
+        """Write a sidecar next to the clone mapping the hashed path back to its repo"""
+        metadata = {
+            "project_id": request.project_id,
+            "repo_url": request.repo_url,
+            "branch": request.branch,
+            "updated_at": time.time()
+        }
+        local_path.with_suffix(".json").write_bytes(orjson.dumps(metadata))
 
     async def clone_repository(self, request: CloneRequest) -> CloneResult:
         """Clone a repository with all optimizations"""
         start_time = time.time()
         local_path = self.get_local_path(request.project_id, request.repo_url)
+        domain = request.domain
 
         try:
             # Check rate limiting
-            domain = urlparse(request.repo_url).netloc
-            allowed, wait_time = await self.rate_limiter.check_rate_limit(domain)
+            allowed, wait_time, failures = await self.rate_limiter.check_window(domain)
 
             if not allowed:
                 logger.warning("Rate limited", domain=domain, wait_time=wait_time)
                 await asyncio.sleep(wait_time)
                 # Re-check after waiting
-                allowed, _ = await self.rate_limiter.check_rate_limit(domain)
+                allowed, _, failures = await self.rate_limiter.check_window(domain)
                 if not allowed:
                     raise Exception(f"Rate limited for domain {domain}")
 
-            # Clean up existing directory if it exists
-            if local_path.exists():
-                shutil.rmtree(local_path)
+            # Update an existing clone in place; only start over when it is unusable
+            updated = False
+            if await self._run_fs((local_path / ".git").exists):
+                if await self._is_valid_repository(local_path):
+                    try:
+                        await self._perform_update(request, local_path)
+                        updated = True
+                    except Exception as e:
+                        logger.warning("Incremental update failed, re-cloning",
+                                       local_path=str(local_path), error=str(e))
 
-            # Create parent directories
-            local_path.parent.mkdir(parents=True, exist_ok=True)
+            if not updated:
+                # Clean up existing directory if it exists
+                if await self._run_fs(local_path.exists):
+                    await self._fast_rmtree(local_path)
 
-            # Perform the clone
-            await self._perform_clone(request, local_path)
+                # Create parent directories
+                await self._run_fs(local_path.parent.mkdir, parents=True, exist_ok=True)
+
+                # Perform the clone
+                await self._perform_clone(request, local_path)
+
+            await self._run_fs(self._write_metadata, local_path, request)
 
             # Get commit hash
             commit_hash = await self._get_commit_hash(local_path)
 
-            # Record success
-            await self.rate_limiter.record_attempt(domain, True)
+            # Record success; nothing to reset when the window was already empty
+            if failures:
+                await self.rate_limiter.record_attempt(domain, True)
 
             duration = time.time() - start_time
             logger.info("Clone successful",
@@ -185,8 +290,7 @@ class GitCloneManager:
             error_msg = str(e)
 
             # Record failure for rate limiting
-            domain = urlparse(request.repo_url).netloc
-            await self.rate_limiter.record_attempt(domain, False)
+            await self.rate_limiter.record_attempt(domain, False, request.request_id)
 
             logger.error("Clone failed",
                         project_id=request.project_id,
@@ -204,9 +308,9 @@ class GitCloneManager:
                 request_id=request.request_id
             )
 
-    async def _perform_clone(self, request: CloneRequest, local_path: Path):
+    async def _perform_clone(self, request: CloneRequest, local_path: Path) -> None:
         """Perform the actual git clone operation"""
-        cmd = ["git", "clone"]
+        cmd = ["git", "clone", "--quiet", "--single-branch"]
 
         # Add shallow clone
         if request.depth > 0:
@@ -215,38 +319,93 @@ class GitCloneManager:
         # Add branch
         cmd.extend(["--branch", request.branch])
 
-        # Add sparse checkout if specified
+        # For sparse checkouts fetch only trees up front; blobs outside the
+        # sparse paths are never downloaded
         if request.sparse_paths:
-            cmd.append("--sparse")
-            # We'll configure sparse checkout after clone
+            cmd.extend(["--filter=blob:none", "--sparse", "--no-checkout"])
 
         # Add repository URL and local path
         cmd.extend([request.repo_url, str(local_path)])
 
-        logger.debug("Executing git clone", command=cmd)
-
         # Run the clone command
+        # Progress output is never read, so only stderr is buffered
         process = await asyncio.create_subprocess_exec(
             *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+            env=self._git_env
         )
 
-        stdout, stderr = await process.communicate()
+        try:
+            _, stderr = await asyncio.wait_for(
+                process.communicate(), timeout=self.clone_timeout
+            )
+        except asyncio.TimeoutError:
+            # Don't let a hung clone hold a concurrency slot
+            process.kill()
+            await process.wait()
+            raise Exception(f"Git clone timed out after {self.clone_timeout}s")
 
         if process.returncode != 0:
-            error_msg = stderr.decode().strip() or stdout.decode().strip()
+            error_msg = stderr.decode().strip()
             raise Exception(f"Git clone failed: {error_msg}")
 
-        # Configure sparse checkout if needed
+        # Configure sparse checkout before populating the working tree
         if request.sparse_paths:
             await self._configure_sparse_checkout(local_path, request.sparse_paths)
+            await self._run_git_command(local_path, ["checkout", request.branch])
 
         # Handle LFS if requested
         if request.include_lfs:
             await self._handle_lfs(local_path)
 
-    async def _configure_sparse_checkout(self, repo_path: Path, sparse_paths: List[str]):
+    async def _fast_rmtree(self, path: Path) -> None:
+        """Remove a directory tree, letting `rm -rf` walk it outside the interpreter"""
+        if sys.platform == "win32":
+            await self._run_fs(shutil.rmtree, path)
+            return
+
+        process = await asyncio.create_subprocess_exec(
+            "rm", "-rf", "--", str(path),
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        await process.wait()
+
+        if process.returncode != 0:
+            raise Exception(f"Failed to remove {path}")
+
+    async def _is_valid_repository(self, repo_path: Path) -> bool:
+        """Check whether an existing clone is a usable git repository"""
+        try:
+            await self._run_git_command(repo_path, ["rev-parse", "--git-dir"])
+            return True
+        except Exception:
+            return False
+
+    async def _perform_update(self, request: CloneRequest, local_path: Path) -> None:
+        """Bring an existing clone up to date, fetching only new objects"""
+        fetch_cmd = ["fetch", "--quiet", "--filter=blob:none"]
+        if request.depth > 0:
+            fetch_cmd.extend(["--depth", str(request.depth)])
+        fetch_cmd.extend(["origin", request.branch])
+
+        await self._run_git_command(local_path, fetch_cmd)
+
+        # Match the requested sparse paths before touching the working tree
+        if request.sparse_paths:
+            await self._configure_sparse_checkout(local_path, request.sparse_paths)
+        elif await self._run_fs((local_path / ".git" / "info" / "sparse-checkout").exists):
+            await self._run_git_command(local_path, ["sparse-checkout", "disable"])
+
+        await self._run_git_command(local_path, ["reset", "--quiet", "--hard", "FETCH_HEAD"])
+        await self._run_git_command(local_path, ["clean", "-fdxq"])
+
+        # Handle LFS if requested
+        if request.include_lfs:
+            await self._handle_lfs(local_path)
+
+    async def _configure_sparse_checkout(self, repo_path: Path, sparse_paths: List[str]) -> None:
         """Configure sparse checkout for the repository"""
         try:
             # Initialize sparse checkout
@@ -258,36 +417,49 @@ class GitCloneManager:
         except Exception as e:
             logger.warning("Failed to configure sparse checkout", error=str(e))
 
-    async def _handle_lfs(self, repo_path: Path):
-        """Handle Git LFS operations"""
+    @property
+    def lfs_available(self) -> bool:
+        """Whether git-lfs is installed; probed once per worker"""
+        if self._lfs_available is None:
+            self._lfs_available = shutil.which("git-lfs") is not None
+        return self._lfs_available
+
+    def _uses_lfs(self, repo_path: Path) -> bool:
+        """Check whether the repository tracks any files with LFS"""
         try:
-            # Check if LFS is installed
-            process = await asyncio.create_subprocess_exec(
-                "git", "lfs", "version",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=repo_path
-            )
-            await process.communicate()
+            attributes = (repo_path / ".gitattributes").read_text(errors="ignore")
+        except OSError:
+            return False
+        return "filter=lfs" in attributes
 
-            if process.returncode == 0:
-                # Pull LFS files
-                await self._run_git_command(repo_path, ["lfs", "pull"])
-                logger.debug("LFS pull completed", repo_path=str(repo_path))
-            else:
+    async def _handle_lfs(self, repo_path: Path) -> None:
+        """Handle Git LFS operations"""
+        try:
+            if not self.lfs_available:
                 logger.debug("Git LFS not available, skipping LFS operations")
+                return
+
+            if not await self._run_fs(self._uses_lfs, repo_path):
+                logger.debug("No LFS-tracked files, skipping LFS pull", repo_path=str(repo_path))
+                return
+
+            # Pull LFS files
+            await self._run_git_command(repo_path, ["lfs", "pull"])
+            logger.debug("LFS pull completed", repo_path=str(repo_path))
 
         except Exception as e:
             logger.warning("LFS operations failed", error=str(e))
 
-    async def _run_git_command(self, repo_path: Path, args: List[str]) -> Tuple[str, str]:
+    async def _run_git_command(self, repo_path: Path, args: List[str],
+                               capture_stdout: bool = False) -> Tuple[str, str]:
         """Run a git command in the repository"""
         cmd = ["git"] + args
         process = await asyncio.create_subprocess_exec(
             *cmd,
-            stdout=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE if capture_stdout else asyncio.subprocess.DEVNULL,
             stderr=asyncio.subprocess.PIPE,
-            cwd=repo_path
+            cwd=repo_path,
+            env=self._git_env
         )
 
         stdout, stderr = await process.communicate()
@@ -296,12 +468,14 @@ class GitCloneManager:
             error_msg = stderr.decode().strip()
             raise Exception(f"Git command failed: {' '.join(cmd)} - {error_msg}")
 
-        return stdout.decode().strip(), stderr.decode().strip()
+        return (stdout or b"").decode().strip(), stderr.decode().strip()
 
     async def _get_commit_hash(self, repo_path: Path) -> Optional[str]:
         """Get the current commit hash"""
         try:
-            stdout, _ = await self._run_git_command(repo_path, ["rev-parse", "HEAD"])
+            stdout, _ = await self._run_git_command(
+                repo_path, ["rev-parse", "HEAD"], capture_stdout=True
+            )
             return stdout.strip()
         except Exception:
             return None
@@ -313,31 +487,59 @@ class CloneWorker:
     def __init__(self, config: Dict):
         self.config = config
         self.workspace_dir = Path(config.get("workspace_dir", "/tmp/ai-docgap/clones"))
+        self.redis_pool = None
         self.redis_client = None
         self.nats_client = None
         self.rate_limiter = None
         self.clone_manager = None
+        self.concurrency = config.get("worker_concurrency", 4)
+        # One FIFO per priority level; the semaphore counts queued messages
+        self._queues: List[Deque[Any]] = [deque() for _ in range(PRIORITY_LEVELS)]
+        self._queued = asyncio.Semaphore(0)
+        self._tasks: Set[asyncio.Task] = set()
+        # Requests whose results are published but not yet flushed
+        self.flush_interval = config.get("flush_interval", 0.05)
+        self._pending_acks: List[Any] = []
 
     async def initialize(self):
         """Initialize connections and components"""
-        # Initialize Redis
-        self.redis_client = redis.Redis(
+        # Initialize Redis with a bounded pool so concurrent clones wait for a
+        # free connection instead of opening new sockets
+        socket_timeout = self.config.get("redis_socket_timeout", 2.0)
+        self.redis_pool = redis.BlockingConnectionPool(
             host=self.config.get("redis_host", "localhost"),
             port=self.config.get("redis_port", 6379),
+            max_connections=self.config.get(
+                "redis_pool_size", self.config.get("worker_concurrency", 4) * 2
+            ),
+            timeout=5,
+            socket_timeout=socket_timeout,
+            socket_connect_timeout=socket_timeout,
             decode_responses=True
         )
+        self.redis_client = redis.Redis(connection_pool=self.redis_pool)
 
         # Initialize NATS
         self.nats_client = NATS()
         await self.nats_client.connect(
-            self.config.get("nats_url", "nats://localhost:4222")
+            self.config.get("nats_url", "nats://localhost:4222"),
+            pending_size=8 * 1024 * 1024,
+            flusher_queue_size=1024
         )
 
         # Initialize rate limiter
-        self.rate_limiter = RateLimiter(self.redis_client)
+        self.rate_limiter = RateLimiter(
+            self.redis_client,
+            max_attempts=self.config.get("max_attempts_per_domain", 3),
+            window_seconds=self.config.get("rate_limit_window_seconds", 3600)
+        )
 
         # Initialize clone manager
-        self.clone_manager = GitCloneManager(self.workspace_dir, self.rate_limiter)
+        self.clone_manager = GitCloneManager(
+            self.workspace_dir,
+            self.rate_limiter,
+            clone_timeout=self.config.get("clone_timeout", 300)
+        )
 
         logger.info("Clone worker initialized",
                    workspace_dir=str(self.workspace_dir))
@@ -346,31 +548,85 @@ class CloneWorker:
         """Main worker loop"""
         await self.initialize()
 
-        # Subscribe to clone requests
-        subject = "repo.clone"
-        queue_group = "clone-workers"
-
-        logger.info("Subscribing to clone requests", subject=subject, queue=queue_group)
+        # Start a fixed pool of dispatchers; each runs one clone at a time
+        background = [self._dispatch_loop() for _ in range(self.concurrency)]
+        background.append(self._periodic_flush())
+        for coro in background:
+            task = asyncio.create_task(coro)
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
 
-        async def message_handler(msg):
-            await self.handle_clone_request(msg)
+        # Subscribe to clone requests, one subject per priority level
+        queue_group = "clone-workers"
 
-        await self.nats_client.subscribe(
-            subject,
-            queue=queue_group,
-            cb=message_handler
-        )
+        def make_handler(priority: int):
+            async def message_handler(msg):
+                # Queue without blocking the subscription on a slow clone
+                self._queues[priority].append(msg)
+                self._queued.release()
+            return message_handler
+
+        subjects = [(clone_subject(p), p) for p in range(PRIORITY_LEVELS)]
+        subjects.append((CLONE_SUBJECT, 1))
+
+        for subject, priority in subjects:
+            logger.info("Subscribing to clone requests", subject=subject, queue=queue_group)
+            await self.nats_client.subscribe(
+                subject,
+                queue=queue_group,
+                cb=make_handler(priority)
+            )
 
         # Keep the worker running
         while True:
             await asyncio.sleep(1)
 
+    def _next_message(self):
+        """Pop the oldest message from the highest-priority non-empty queue"""
+        for queue in self._queues:
+            if queue:
+                return queue.popleft()
+        return None
+
+    async def _dispatch_loop(self):
+        """Handle queued clone requests, highest priority first"""
+        while True:
+            await self._queued.acquire()
+            msg = self._next_message()
+            if msg is not None:
+                await self.handle_clone_request(msg)
+
+    async def _periodic_flush(self):
+        """Flush published results in batches, then ack the requests behind them"""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            if not self._pending_acks:
+                continue
+
+            batch, self._pending_acks = self._pending_acks, []
+            try:
+                await self.nats_client.flush(timeout=1)
+            except Exception as e:
+                # Keep the batch unacked and retry on the next tick
+                logger.warning("Failed to flush clone results", error=str(e))
+                self._pending_acks = batch + self._pending_acks
+                continue
+
+            for msg in batch:
+                try:
+                    await msg.ack()
+                except Exception as e:
+                    logger.warning("Failed to ack clone request", error=str(e))
+
     async def handle_clone_request(self, msg):
         """Handle incoming clone request"""
         try:
             # Parse the request
-            data = json.loads(msg.data.decode())
-            request = CloneRequest(**data)
+            try:
+                request = REQUEST_DECODER.decode(msg.data)
+            except msgspec.MsgspecError as e:
+                await self._reject_request(msg, str(e))
+                return
 
             logger.info("Processing clone request",
                        project_id=request.project_id,
@@ -381,23 +637,23 @@ class CloneWorker:
             result = await self.clone_manager.clone_repository(request)
 
             # Publish result
-            result_data = {
-                "project_id": result.project_id,
-                "repo_url": result.repo_url,
-                "local_path": result.local_path,
-                "success": result.success,
-                "error_message": result.error_message,
-                "commit_hash": result.commit_hash,
-                "clone_duration": result.clone_duration,
-                "request_id": result.request_id,
-                "timestamp": time.time()
-            }
+            result_message = CloneResultMessage(
+                project_id=result.project_id,
+                repo_url=result.repo_url,
+                local_path=result.local_path,
+                success=result.success,
+                error_message=result.error_message,
+                commit_hash=result.commit_hash,
+                clone_duration=result.clone_duration,
+                request_id=result.request_id,
+                timestamp=time.time()
+            )
 
             result_subject = "repo.clone.result"
-            await self.nats_client.publish(result_subject, json.dumps(result_data).encode())
+            await self.nats_client.publish(result_subject, RESULT_ENCODER.encode(result_message))
 
-            # Acknowledge the message
-            await msg.ack()
+            # Acknowledge once the result has been flushed
+            self._pending_acks.append(msg)
 
             logger.info("Clone request processed",
                        project_id=request.project_id,
@@ -407,12 +663,46 @@ class CloneWorker:
             logger.error("Failed to process clone request", error=str(e))
             # In a production system, you might want to handle retries here
 
+    async def _reject_request(self, msg, error):
+        """Publish a failed result for a request that could not be decoded or validated"""
+        logger.warning("Rejected clone request", error=error)
+        try:
+            fields = orjson.loads(msg.data)
+        except orjson.JSONDecodeError:
+            fields = None
+        if not isinstance(fields, dict):
+            fields = {}
+
+        def text(key: str) -> str:
+            value = fields.get(key)
+            return value if isinstance(value, str) else ""
+
+        result_message = CloneResultMessage(
+            project_id=text("project_id"),
+            repo_url=text("repo_url"),
+            local_path="",
+            success=False,
+            error_message=f"Invalid clone request: {error}",
+            commit_hash=None,
+            clone_duration=0.0,
+            request_id=text("request_id"),
+            timestamp=time.time()
+        )
+        await self.nats_client.publish("repo.clone.result", RESULT_ENCODER.encode(result_message))
+
+        # Redelivery would be rejected the same way
+        self._pending_acks.append(msg)
+
     async def shutdown(self):
         """Clean shutdown"""
         if self.nats_client:
             await self.nats_client.close()
         if self.redis_client:
             await self.redis_client.close()
+        if self.redis_pool:
+            await self.redis_pool.disconnect()
+        if self.clone_manager:
+            self.clone_manager.close()
 
 
 async def main():
@@ -421,7 +711,13 @@ async def main():
     config = {
         "redis_host": os.getenv("REDIS_HOST", "localhost"),
         "redis_port": int(os.getenv("REDIS_PORT", "6379")),
+        "redis_pool_size": int(os.getenv("REDIS_POOL_SIZE", "8")),
+        "redis_socket_timeout": float(os.getenv("REDIS_SOCKET_TIMEOUT", "2")),
+        "worker_concurrency": int(os.getenv("WORKER_CONCURRENCY", "4")),
+        "max_attempts_per_domain": int(os.getenv("MAX_ATTEMPTS_PER_DOMAIN", "3")),
+        "rate_limit_window_seconds": int(os.getenv("RATE_LIMIT_WINDOW_SECONDS", "3600")),
         "nats_url": os.getenv("NATS_URL", "nats://localhost:4222"),
+        "clone_timeout": int(os.getenv("MAX_CLONE_TIMEOUT", "300")),
         "workspace_dir": os.getenv("CLONE_WORKSPACE_DIR", "/tmp/ai-docgap/clones"),
     }
 
@@ -447,4 +743,11 @@ async def main():
 
 
 if __name__ == "__main__":
+    # Prefer uvloop where it is available; it is not supported on Windows
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     asyncio.run(main())
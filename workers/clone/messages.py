@@ -0,0 +1,70 @@
+# Clone Worker Messages
+#
+# Wire types and codecs for the clone worker's NATS traffic. They live outside
+# main.py so the mypyc build (setup.py) never compiles them: msgspec reads
+# field defaults from the class, and a native dataclass no longer exposes them,
+# so a compiled CloneRequest decodes missing fields as 0/False.
+
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional
+from urllib.parse import urlparse
+
+import msgspec
+
+
+ALLOWED_URL_SCHEMES = ("https", "git", "ssh")
+# git's scp-like SSH syntax, [user@]host:path; host and user may not start with
+# '-' so the URL can never be read as a git option
+_SCP_URL_RE = re.compile(r"^(?:[A-Za-z0-9][\w.-]*@)?([A-Za-z0-9][\w.-]*):(?!//)\S+$")
+
+
+@dataclass(slots=True, frozen=True)
+class CloneRequest:
+    """Clone request data structure
+
+    Producers publish to `clone_subject(priority)`; p0 is drained first,
+    then p1, then p2. Requests on the bare `repo.clone` subject are treated
+    as p1.
+    """
+    project_id: str
+    repo_url: str
+    branch: str = "main"
+    depth: int = 1
+    sparse_paths: Optional[List[str]] = None
+    include_lfs: bool = True
+    priority: int = 0
+    request_id: str = ""
+    domain: str = field(default="", init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        parsed = urlparse(self.repo_url)
+        # The domain keys rate limits and logs: bare host only, never userinfo or port
+        if parsed.scheme in ALLOWED_URL_SCHEMES and parsed.hostname:
+            domain = parsed.hostname
+        else:
+            scp = _SCP_URL_RE.match(self.repo_url)
+            if not scp:
+                raise ValueError(f"Unsupported repository URL: {self.repo_url}")
+            domain = scp.group(1).lower()
+        # Frozen, so derived fields are set through object.__setattr__
+        object.__setattr__(self, "domain", domain)
+
+
+class CloneResultMessage(msgspec.Struct):
+    """Clone result as published on NATS"""
+    project_id: str
+    repo_url: str
+    local_path: str
+    success: bool
+    error_message: Optional[str]
+    commit_hash: Optional[str]
+    clone_duration: float
+    request_id: str
+    timestamp: float
+
+
+# Reused codecs: requests are validated while decoding, results are encoded
+# straight from struct fields without an intermediate dict
+REQUEST_DECODER = msgspec.json.Decoder(CloneRequest)
+RESULT_ENCODER = msgspec.json.Encoder()
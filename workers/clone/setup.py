@@ -0,0 +1,23 @@
+# Clone Worker AOT build
+#
+# Compiles main.py into a same-named C extension with mypyc so the per-message
+# paths (RateLimiter, GitCloneManager) run as native code:
+#
+#     python setup.py build_ext --inplace
+#
+# Imports such as `from main import CloneWorker` pick up the compiled module
+# transparently; delete the generated .so to go back to the pure-Python source.
+# Native classes reject monkeypatched methods and mock attributes, so run
+# test_clone.py against the source module (test_compiled_request_defaults
+# builds its own copy).
+#
+# messages.py is deliberately left out: msgspec reads field defaults from the
+# request class, and a mypyc-compiled dataclass does not expose them.
+
+from setuptools import setup
+from mypyc.build import mypycify
+
+setup(
+    name="ai-docgap-clone-worker",
+    ext_modules=mypycify(["--ignore-missing-imports", "main.py"]),
+)
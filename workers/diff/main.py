@@ -16,27 +16,36 @@ Features:
 """
 
 import asyncio
-import json
-import logging
+import contextlib
+import hashlib
 import os
+import random
 import re
+import resource
+import shutil
+import signal
 import sys
+import threading
 import time
-import tempfile
-import subprocess
-from dataclasses import dataclass, asdict
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple, Set
-from urllib.parse import urlparse, urljoin
+from typing import Callable, Dict, List, Optional, Any, Tuple, Set
+from urllib.parse import urlparse
 
-import aiofiles
 import httpx
+import orjson
 from nats.aio.client import Client as NATS
-from nats.aio.errors import ErrTimeout
 import redis.asyncio as redis
 import structlog
 import yaml
 
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 # Configure structured logging
 structlog.configure(
     processors=[
@@ -51,15 +60,25 @@ structlog.configure(
         structlog.processors.JSONRenderer()
     ],
     context_class=dict,
-    logger_factory=structlog.StdlibLoggerFactory(),
+    logger_factory=structlog.stdlib.LoggerFactory(),
     wrapper_class=structlog.stdlib.BoundLogger,
     cache_logger_on_first_use=True,
 )
 
 logger = structlog.get_logger()
 
+# NATS subject diff results are published on
+_RESULT_SUBJECT = "delta.diff.result"
+
+# API specification files: JSON/YAML whose name mentions one of the keywords
+_SPEC_KEYWORDS = ('openapi', 'swagger', 'api', 'schema', 'graphql')
+_SPEC_SUFFIXES = ('.json', '.yaml', '.yml')
+_SPEC_RE = re.compile(
+    rf"({'|'.join(_SPEC_KEYWORDS)}).*\.(json|ya?ml)$", re.IGNORECASE
+)
 
-@dataclass
+
+@dataclass(slots=True)
 class SchemaDrift:
     """Represents schema drift between spec and implementation"""
     id: str
@@ -75,7 +94,7 @@ class SchemaDrift:
     suggestions: Optional[List[str]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class BrokenLink:
     """Represents a broken link in documentation"""
     id: str
@@ -90,7 +109,7 @@ class BrokenLink:
     retry_count: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class SnippetResult:
     """Result of executing a code snippet"""
     id: str
@@ -106,7 +125,7 @@ class SnippetResult:
     exit_code: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class DiffRequest:
     """Diff analysis request"""
     project_id: str
@@ -119,7 +138,7 @@ class DiffRequest:
     request_id: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class DiffResult:
     """Diff analysis result"""
     project_id: str
@@ -139,72 +158,206 @@ class DiffResult:
 class SchemaDriftDetector:
     """Detects drift between API specs and implementations"""
 
-    def __init__(self):
+    def __init__(self, cache_dir: Optional[Path] = None, memory_cache_size: int = 256,
+                 disk_cache_max_bytes: int = 256 * 1024 * 1024):
         self.supported_formats = ['openapi', 'swagger', 'graphql']
+        self.max_concurrent_files = 8
+        # Parsed specs keyed by path, mtime and size, so edits invalidate them
+        self.cache_dir = cache_dir
+        self.memory_cache_size = memory_cache_size
+        # The disk cache is trimmed, least recently used first, whenever another
+        # tenth of its budget has been written (and on the first write)
+        self.disk_cache_max_bytes = disk_cache_max_bytes
+        self._bytes_since_prune = disk_cache_max_bytes
+        self._prune_lock = threading.Lock()
+        # Each entry keeps the spec type next to the parse so it is identified once
+        self._spec_cache: OrderedDict[str, Tuple[Dict, str]] = OrderedDict()
 
     async def detect_drift(self, spec_files: List[Path], entities: List[Dict]) -> List[SchemaDrift]:
         """Detect schema drift across specification files"""
         drifts = []
 
-        for spec_file in spec_files:
-            try:
-                spec_drifts = await self._analyze_spec_file(spec_file, entities)
-                drifts.extend(spec_drifts)
-            except Exception as e:
+        # Index entities once for all spec files
+        endpoint_map = {e['name']: e for e in entities if e.get('kind') == 'endpoint'}
+        type_map = {e['name']: e for e in entities if e.get('kind') in ['type', 'function']}
+
+        # Bound open files while specs are loaded and parsed in parallel
+        semaphore = asyncio.Semaphore(self.max_concurrent_files)
+
+        async def analyze(spec_file: Path) -> List[SchemaDrift]:
+            async with semaphore:
+                return await self._analyze_spec_file(spec_file, endpoint_map, type_map)
+
+        results = await asyncio.gather(
+            *(analyze(spec_file) for spec_file in spec_files),
+            return_exceptions=True
+        )
+
+        for spec_file, result in zip(spec_files, results):
+            if isinstance(result, Exception):
                 logger.error("Failed to analyze spec file",
                            file=str(spec_file),
-                           error=str(e))
+                           error=str(result))
+            else:
+                drifts.extend(result)
 
         return drifts
 
-    async def _analyze_spec_file(self, spec_file: Path, entities: List[Dict]) -> List[SchemaDrift]:
+    async def _analyze_spec_file(self, spec_file: Path, endpoint_map: Dict[str, Dict],
+                                 type_map: Dict[str, Dict]) -> List[SchemaDrift]:
         """Analyze a single specification file"""
         drifts = []
 
-        # Load spec
-        spec = await self._load_spec(spec_file)
-        if not spec:
+        # Load spec along with its type
+        loaded = await self._load_spec(spec_file)
+        if not loaded:
             return drifts
+        spec, spec_type = loaded
 
-        # Determine spec type
-        spec_type = self._identify_spec_type(spec)
-
-        if spec_type in ['openapi', 'swagger']:
-            drifts.extend(await self._analyze_openapi_spec(spec, spec_file, entities))
+        if spec_type == 'openapi':
+            drifts.extend(await self._analyze_openapi_spec(spec, spec_file, endpoint_map))
         elif spec_type == 'graphql':
-            drifts.extend(await self._analyze_graphql_spec(spec, spec_file, entities))
+            drifts.extend(await self._analyze_graphql_spec(spec, spec_file, type_map))
 
         return drifts
 
-    async def _load_spec(self, spec_file: Path) -> Optional[Dict]:
-        """Load specification from file"""
+    async def _load_spec(self, spec_file: Path) -> Optional[Tuple[Dict, str]]:
+        """Load specification and its type from file, reusing parses of unchanged files"""
         try:
-            async with aiofiles.open(spec_file, 'r', encoding='utf-8') as f:
-                content = await f.read()
-
-            # Try YAML first, then JSON
-            try:
-                return yaml.safe_load(content)
-            except yaml.YAMLError:
-                return json.loads(content)
+            stat = await asyncio.to_thread(spec_file.stat)
+            cache_key = f"{spec_file}:{stat.st_mtime_ns}:{stat.st_size}"
+
+            entry = self._spec_cache.get(cache_key)
+            if entry is not None:
+                self._spec_cache.move_to_end(cache_key)
+                return entry
+
+            spec = None
+
+            if self.cache_dir:
+                spec = await asyncio.to_thread(self._read_cached_spec, cache_key)
+
+            if spec is None:
+                # Both parsers accept bytes, so skip decoding to str
+                content = await asyncio.to_thread(spec_file.read_bytes)
+                spec = self._parse_spec(spec_file, content)
+                if spec is None:
+                    return None
+                if self.cache_dir:
+                    await asyncio.to_thread(self._write_cached_spec, cache_key, spec)
+
+            if not spec:
+                return None
+
+            entry = (spec, self._identify_spec_type(spec))
+            self._spec_cache[cache_key] = entry
+            if len(self._spec_cache) > self.memory_cache_size:
+                self._spec_cache.popitem(last=False)
+            return entry
         except Exception as e:
             logger.warning("Failed to load spec file", file=str(spec_file), error=str(e))
             return None
 
+    def _parse_spec(self, spec_file: Path, content: bytes) -> Optional[Dict]:
+        """Parse spec file content as JSON or YAML"""
+        # JSON specs skip the YAML parser entirely
+        if spec_file.suffix.lower() == '.json':
+            try:
+                return orjson.loads(content)
+            except orjson.JSONDecodeError:
+                pass
+
+        # Try YAML first, then JSON
+        try:
+            return yaml.load(content, Loader=SafeLoader)
+        except yaml.YAMLError:
+            return orjson.loads(content)
+
+    def _cached_spec_path(self, cache_key: str) -> Path:
+        """On-disk location of a parsed spec"""
+        return self.cache_dir / f"{hashlib.sha1(cache_key.encode()).hexdigest()}.json"
+
+    def _read_cached_spec(self, cache_key: str) -> Optional[Dict]:
+        """Read a previously parsed spec from the disk cache"""
+        path = self._cached_spec_path(cache_key)
+        try:
+            spec = orjson.loads(path.read_bytes())
+            # Bump the mtime so pruning treats the entry as recently used
+            os.utime(path)
+            return spec
+        except (OSError, orjson.JSONDecodeError):
+            return None
+
+    def _write_cached_spec(self, cache_key: str, spec: Dict):
+        """Store a parsed spec in the disk cache"""
+        try:
+            data = orjson.dumps(spec, option=orjson.OPT_NON_STR_KEYS)
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._cached_spec_path(cache_key).write_bytes(data)
+        except (OSError, TypeError) as e:
+            logger.warning("Failed to cache parsed spec", error=str(e))
+            return
+
+        # Writers run in worker threads: count and claim the prune under the lock
+        # so exactly one of them trims the cache per tenth of the budget
+        with self._prune_lock:
+            self._bytes_since_prune += len(data)
+            prune = self._bytes_since_prune >= self.disk_cache_max_bytes // 10
+            if prune:
+                self._bytes_since_prune = 0
+        if prune:
+            self._prune_disk_cache()
+
+    def _prune_disk_cache(self):
+        """Delete the least recently used cached specs until the cache fits its budget"""
+        try:
+            entries = []
+            total = 0
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                    total += stat.st_size
+
+            if total <= self.disk_cache_max_bytes:
+                return
+            entries.sort()
+            removed = 0
+            for _, size, path in entries:
+                if total <= self.disk_cache_max_bytes:
+                    break
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                removed += 1
+            logger.info("Pruned spec disk cache", removed=removed, size=total)
+        except OSError as e:
+            logger.warning("Failed to prune spec disk cache", error=str(e))
+
     def _identify_spec_type(self, spec: Dict) -> str:
         """Identify the type of API specification"""
+        # YAML may parse to a list or scalar, where `in` would match substrings
+        if not isinstance(spec, dict):
+            return 'unknown'
         if 'openapi' in spec or 'swagger' in spec:
             return 'openapi'
-        elif 'data' in spec and '__schema' in spec.get('data', {}):
+        # GraphQL introspection results, with or without the response envelope
+        data = spec.get('data')
+        if '__schema' in spec or (isinstance(data, dict) and '__schema' in data):
             return 'graphql'
         return 'unknown'
 
-    async def _analyze_openapi_spec(self, spec: Dict, spec_file: Path, entities: List[Dict]) -> List[SchemaDrift]:
+    async def _analyze_openapi_spec(self, spec: Dict, spec_file: Path,
+                                    entity_map: Dict[str, Dict]) -> List[SchemaDrift]:
         """Analyze OpenAPI/Swagger specification"""
         drifts = []
 
         paths = spec.get('paths', {})
-        entity_map = {e['name']: e for e in entities if e.get('kind') == 'endpoint'}
 
         for path, methods in paths.items():
             if not isinstance(methods, dict):
@@ -237,15 +390,14 @@ class SchemaDriftDetector:
 
         return drifts
 
-    async def _analyze_graphql_spec(self, spec: Dict, spec_file: Path, entities: List[Dict]) -> List[SchemaDrift]:
+    async def _analyze_graphql_spec(self, spec: Dict, spec_file: Path,
+                                    entity_map: Dict[str, Dict]) -> List[SchemaDrift]:
         """Analyze GraphQL schema"""
         drifts = []
 
-        schema_data = spec.get('data', {}).get('__schema', {})
+        schema_data = spec.get('__schema') or spec.get('data', {}).get('__schema', {})
         types = schema_data.get('types', [])
 
-        entity_map = {e['name']: e for e in entities if e.get('kind') in ['type', 'function']}
-
         for type_info in types:
             if not isinstance(type_info, dict):
                 continue
@@ -290,21 +442,57 @@ class SchemaDriftDetector:
         return drifts
 
 
+# Ranged, uncompressed GET used when a server rejects HEAD
+_GET_FALLBACK_HEADERS = {"Range": "bytes=0-0", "Accept-Encoding": "identity"}
+
+
 class LinkChecker:
     """Checks for broken links in documentation"""
 
     def __init__(self, redis_client: redis.Redis):
         self.redis = redis_client
+        # HTTP/2 multiplexes checks against the same host over one connection
         self.http_client = httpx.AsyncClient(
-            timeout=10.0,
+            http2=True,
+            timeout=httpx.Timeout(connect=5.0, read=10.0, write=5.0, pool=10.0),
             follow_redirects=True,
-            limits=httpx.Limits(max_connections=20)
+            limits=httpx.Limits(
+                max_connections=500,
+                max_keepalive_connections=100,
+                keepalive_expiry=60
+            ),
+            headers={"User-Agent": "docgap-link-checker/1"}
         )
         self.cache_ttl = 3600  # 1 hour
+        # Cap concurrent checks per host so one site isn't hammered
+        self.per_host_limit = 4
+        # Entries only live while a check for the host is running or waiting
+        self._host_sems: Dict[str, asyncio.Semaphore] = {}
+        self._host_users: Dict[str, int] = {}
+        # Transient read/protocol errors are retried with jittered backoff
+        self.max_retries = 2
+        self.retry_backoff = 0.5
+
+    @contextlib.asynccontextmanager
+    async def _host_slot(self, host: str):
+        """Hold one of a host's check slots, dropping its semaphore once idle"""
+        host_sem = self._host_sems.get(host)
+        if host_sem is None:
+            host_sem = self._host_sems[host] = asyncio.Semaphore(self.per_host_limit)
+        self._host_users[host] = self._host_users.get(host, 0) + 1
+        try:
+            async with host_sem:
+                yield
+        finally:
+            self._host_users[host] -= 1
+            if not self._host_users[host]:
+                del self._host_users[host]
+                del self._host_sems[host]
 
-    async def check_links(self, docs: List[Dict], include_external: bool = False) -> List[BrokenLink]:
+    async def check_links(self, docs: List[Dict], include_external: bool = False,
+                          max_concurrent: int = 10) -> List[BrokenLink]:
         """Check links in documentation files"""
-        broken_links = []
+        links = []
 
         for doc in docs:
             doc_links = doc.get('links', [])
@@ -314,55 +502,62 @@ class LinkChecker:
                 if not isinstance(link, dict):
                     continue
 
-                link_url = link.get('url', '')
-                link_text = link.get('text', '')
-                line_number = link.get('line_number', 0)
-
                 # Skip external links if not requested
                 is_external = link.get('is_external', False)
                 if is_external and not include_external:
                     continue
 
-                # Check cache first
-                cached_result = await self._get_cached_result(link_url)
-                if cached_result:
-                    if cached_result['broken']:
-                        broken_links.append(BrokenLink(
-                            id=f"broken_{doc_path}_{line_number}",
-                            project_id="",  # Set by caller
-                            doc_path=doc_path,
-                            link_url=link_url,
-                            link_text=link_text,
-                            line_number=line_number,
-                            error_type=cached_result['error_type'],
-                            error_message=cached_result['error_message'],
-                            last_checked=cached_result['last_checked'],
-                            retry_count=cached_result['retry_count']
-                        ))
-                    continue
+                links.append((
+                    doc_path,
+                    link.get('url', ''),
+                    link.get('text', ''),
+                    link.get('line_number', 0)
+                ))
 
-                # Check the link
-                is_broken, error_type, error_msg = await self._check_single_link(link_url)
+        # Check each distinct URL once; cached URLs are resolved in one MGET
+        urls = list(dict.fromkeys(link[1] for link in links))
+        results = await self._get_cached_results(urls)
+        misses = [url for url in urls if url not in results]
 
-                # Cache the result
-                await self._cache_result(link_url, is_broken, error_type, error_msg)
+        semaphore = asyncio.Semaphore(max_concurrent)
 
-                if is_broken:
-                    broken_links.append(BrokenLink(
-                        id=f"broken_{doc_path}_{line_number}",
-                        project_id="",  # Set by caller
-                        doc_path=doc_path,
-                        link_url=link_url,
-                        link_text=link_text,
-                        line_number=line_number,
-                        error_type=error_type,
-                        error_message=error_msg,
-                        last_checked=time.time()
-                    ))
+        async def check(url: str) -> Tuple[bool, str, str]:
+            async with semaphore:
+                return await self._check_single_link(url)
+
+        checked = await asyncio.gather(*(check(url) for url in misses))
+        fresh = {
+            url: self._make_result(is_broken, error_type, error_msg)
+            for url, (is_broken, error_type, error_msg) in zip(misses, checked)
+        }
+
+        # Cache the results
+        await self._cache_results(fresh)
+        results.update(fresh)
+
+        broken_links = []
+        for doc_path, link_url, link_text, line_number in links:
+            result = results[link_url]
+            if result['broken']:
+                broken_links.append(BrokenLink(
+                    id=f"broken_{doc_path}_{line_number}",
+                    project_id="",  # Set by caller
+                    doc_path=doc_path,
+                    link_url=link_url,
+                    link_text=link_text,
+                    line_number=line_number,
+                    error_type=result['error_type'],
+                    error_message=result['error_message'],
+                    last_checked=result['last_checked'],
+                    retry_count=result['retry_count']
+                ))
 
-        await self.http_client.aclose()
         return broken_links
 
+    async def close(self):
+        """Close the shared HTTP client"""
+        await self.http_client.aclose()
+
     async def _check_single_link(self, url: str) -> Tuple[bool, str, str]:
         """Check a single link"""
         try:
@@ -371,10 +566,11 @@ class LinkChecker:
                 # Can't check relative URLs without base
                 return True, "relative_url", "Cannot check relative URLs"
 
-            response = await self.http_client.head(url)
+            async with self._host_slot(urlparse(url).netloc):
+                status = await self._fetch_status(url)
 
-            if response.status_code >= 400:
-                return True, "http_error", f"HTTP {response.status_code}"
+            if status >= 400:
+                return True, "http_error", f"HTTP {status}"
 
             return False, "", ""
 
@@ -385,19 +581,44 @@ class LinkChecker:
         except Exception as e:
             return True, "unknown_error", str(e)
 
-    async def _get_cached_result(self, url: str) -> Optional[Dict]:
-        """Get cached link check result"""
-        cache_key = f"link_check:{url}"
-        cached = await self.redis.get(cache_key)
-
-        if cached:
-            return json.loads(cached)
-        return None
+    async def _fetch_status(self, url: str) -> int:
+        """Get the status code for a URL, retrying transient connection failures"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await self.http_client.head(url)
+                status = response.status_code
+
+                # Some servers reject HEAD; retry with a minimal ranged GET.
+                # Only the status line is needed, so the body is never read
+                # (servers that ignore Range would otherwise send the whole page)
+                if status in (403, 405):
+                    async with self.http_client.stream(
+                        "GET", url, headers=_GET_FALLBACK_HEADERS
+                    ) as response:
+                        status = response.status_code
+
+                return status
+
+            except (httpx.ReadError, httpx.RemoteProtocolError):
+                if attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(self.retry_backoff * 2 ** attempt * random.uniform(0.5, 1.5))
+
+    async def _get_cached_results(self, urls: List[str]) -> Dict[str, Dict]:
+        """Get cached link check results for all URLs in a single round trip"""
+        if not urls:
+            return {}
+
+        cached = await self.redis.mget([f"link_check:{url}" for url in urls])
+        return {
+            url: orjson.loads(value)
+            for url, value in zip(urls, cached)
+            if value
+        }
 
-    async def _cache_result(self, url: str, broken: bool, error_type: str, error_msg: str):
-        """Cache link check result"""
-        cache_key = f"link_check:{url}"
-        result = {
+    def _make_result(self, broken: bool, error_type: str, error_msg: str) -> Dict:
+        """Build a link check result entry"""
+        return {
             'broken': broken,
             'error_type': error_type,
             'error_message': error_msg,
@@ -405,13 +626,298 @@ class LinkChecker:
             'retry_count': 0
         }
 
-        await self.redis.setex(cache_key, self.cache_ttl, json.dumps(result))
+    async def _cache_results(self, results: Dict[str, Dict]):
+        """Cache link check results in one pipelined batch"""
+        if not results:
+            return
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for url, result in results.items():
+                pipe.setex(f"link_check:{url}", self.cache_ttl, orjson.dumps(result))
+            await pipe.execute()
+
+
+# Driver run by each persistent Python interpreter. It reads NDJSON requests
+# ({"code": ...}) from the original stdin and writes one NDJSON reply per
+# snippet to the original stdout. Every snippet runs in a forked child with the
+# CPU limit applied, an empty stdin and captured output, so nothing it imports,
+# patches or leaks outlives it; the driver only trusts what it re-validates.
+# argv: memory limit (bytes), CPU limit (seconds, 0 for none).
+_PYTHON_SNIPPET_DRIVER = r"""
+import contextlib, io, json, os, resource, sys, traceback
+
+MAX_OUTPUT = 1024 * 1024
+MAX_REPLY = 8 * MAX_OUTPUT
+MAX_LINE = 4 * MAX_OUTPUT - 1  # InterpreterPool's readline limit
+MEMORY_LIMIT, CPU_LIMIT = int(sys.argv[1]), int(sys.argv[2])
+
+try:
+    resource.setrlimit(resource.RLIMIT_AS, (MEMORY_LIMIT, MEMORY_LIMIT))
+except (ValueError, OSError):
+    pass
+
+requests = os.fdopen(os.dup(0), "r")
+replies = os.fdopen(os.dup(1), "w")
+devnull = os.open(os.devnull, os.O_RDWR)
+os.dup2(devnull, 0)
+os.dup2(devnull, 1)
+
+
+def run_snippet(code, result_fd):
+    os.close(requests.fileno())
+    os.close(replies.fileno())
+    if CPU_LIMIT:
+        resource.setrlimit(resource.RLIMIT_CPU, (CPU_LIMIT, CPU_LIMIT))
+    out, err = io.StringIO(), io.StringIO()
+    exit_code = 0
+    sys.stdin = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            exec(compile(code, "<snippet>", "exec"), {"__name__": "__main__"})
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            exit_code = e.code or 0
+        else:
+            err.write(str(e.code) + "\n")
+            exit_code = 1
+    except BaseException:
+        etype, value, tb = sys.exc_info()
+        err.write("".join(traceback.format_exception(etype, value, tb.tb_next)))
+        exit_code = 1
+    with os.fdopen(result_fd, "w") as result:
+        result.write(json.dumps({
+            "stdout": out.getvalue()[:MAX_OUTPUT],
+            "stderr": err.getvalue()[:MAX_OUTPUT],
+            "exit_code": exit_code,
+        }))
+
+
+for line in requests:
+    code = json.loads(line)["code"]
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.close(read_fd)
+            run_snippet(code, write_fd)
+        finally:
+            os._exit(0)
+
+    os.close(write_fd)
+    with os.fdopen(read_fd, "rb") as result:
+        raw = result.read(MAX_REPLY + 1)
+    _, status = os.waitpid(pid, 0)
+    if len(raw) > MAX_REPLY:
+        reply = {"stdout": "", "stderr": "Snippet output too large", "exit_code": 1}
+    else:
+        reply = None
+    try:
+        reply = reply or json.loads(raw)
+        reply = {
+            "stdout": str(reply["stdout"])[:MAX_OUTPUT],
+            "stderr": str(reply["stderr"])[:MAX_OUTPUT],
+            "exit_code": int(reply["exit_code"]),
+        }
+    except Exception:
+        # Killed (CPU/memory limit, signal) or tampered with its own reply
+        status_code = os.waitstatus_to_exitcode(status)
+        reply = {
+            "stdout": "",
+            "stderr": f"Snippet process terminated abnormally (status {status_code})",
+            "exit_code": status_code or 1,
+        }
+    line = json.dumps(reply)
+    if len(line) > MAX_LINE:
+        line = json.dumps({"stdout": "", "stderr": "Snippet output too large", "exit_code": 1})
+    replies.write(line + "\n")
+    replies.flush()
+"""
+
+
+# Resource caps applied to every snippet process
+SNIPPET_MEMORY_LIMIT = 2 * 1024 ** 3  # bytes of address space
+SNIPPET_CPU_LIMIT = 30  # seconds
+
+
+def _limit_resources(cpu_seconds: Optional[int] = SNIPPET_CPU_LIMIT):
+    """Build a preexec_fn that caps memory and, optionally, CPU time"""
+    def apply():
+        resource.setrlimit(resource.RLIMIT_AS, (SNIPPET_MEMORY_LIMIT, SNIPPET_MEMORY_LIMIT))
+        if cpu_seconds:
+            resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds))
+    return apply
+
+
+class SnippetSandbox:
+    """Isolates snippet processes with bubblewrap, falling back to unshare"""
+
+    # Read-only system directories, private /tmp, no network or shared namespaces
+    BWRAP_ARGS = [
+        '--ro-bind', '/usr', '/usr',
+        '--ro-bind-try', '/bin', '/bin',
+        '--ro-bind-try', '/lib', '/lib',
+        '--ro-bind-try', '/lib64', '/lib64',
+        '--ro-bind-try', '/etc', '/etc',
+        '--proc', '/proc',
+        '--dev', '/dev',
+        '--tmpfs', '/tmp',
+        '--chdir', '/tmp',
+        '--unshare-all',
+        '--die-with-parent',
+        '--new-session',
+    ]
+
+    def __init__(self):
+        self.mode: Optional[str] = None
+
+    async def detect(self):
+        """Pick the strongest isolation that actually works on this host"""
+        candidates = []
+        if shutil.which('bwrap'):
+            candidates.append('bwrap')
+        if shutil.which('unshare'):
+            candidates.append('unshare')
+
+        for mode in candidates:
+            self.mode = mode
+            if await self._works():
+                logger.info("Snippet sandbox enabled", mode=mode)
+                return
+
+        self.mode = 'none'
+        logger.warning("No usable snippet sandbox; snippets run without isolation")
+
+    async def _works(self) -> bool:
+        """Check the current mode can start a trivial process"""
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *self.wrap(['true']),
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+            return await process.wait() == 0
+        except OSError:
+            return False
+
+    def wrap(self, argv: List[str]) -> List[str]:
+        """Prefix a command with the sandbox launcher"""
+        if self.mode == 'bwrap':
+            return ['bwrap', *self.BWRAP_ARGS, '--', *argv]
+        if self.mode == 'unshare':
+            # New user and network namespaces: no egress, no real root
+            return ['unshare', '-Urn', *argv]
+        return list(argv)
+
+
+class InterpreterPool:
+    """Pool of long-lived interpreter processes that execute snippets sent over stdin"""
+
+    def __init__(self, argv: List[str], size: int = 4, timeout: float = 30.0,
+                 preexec_fn: Optional[Callable[[], None]] = None):
+        self.argv = argv
+        self.size = size
+        self.timeout = timeout
+        self.preexec_fn = preexec_fn
+        self._idle: Optional[asyncio.Queue] = None
+        self._processes: Set[asyncio.subprocess.Process] = set()
+
+    async def start(self):
+        """Spawn the interpreter processes"""
+        self._idle = asyncio.Queue()
+        for _ in range(self.size):
+            self._idle.put_nowait(await self._spawn())
+
+    async def _spawn(self) -> asyncio.subprocess.Process:
+        """Start a single interpreter process"""
+        process = await asyncio.create_subprocess_exec(
+            *self.argv,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            limit=4 * 1024 * 1024,
+            preexec_fn=self.preexec_fn,
+            # Own process group, so the forked snippet dies with its interpreter
+            start_new_session=True
+        )
+        self._processes.add(process)
+        return process
+
+    async def _kill(self, process: asyncio.subprocess.Process):
+        """Kill an interpreter's whole process group, including a running snippet"""
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        await process.wait()
+        self._processes.discard(process)
+
+    async def _replace(self, process: asyncio.subprocess.Process) -> asyncio.subprocess.Process:
+        """Kill a misbehaving interpreter and start a fresh one"""
+        await self._kill(process)
+        return await self._spawn()
+
+    async def run(self, code: str) -> Tuple[bool, Optional[str], Optional[str], Optional[int]]:
+        """Execute code on an idle interpreter"""
+        process = await self._idle.get()
+        # Only an interpreter whose reply was read in full goes back to the pool
+        in_sync = False
+        try:
+            if process.returncode is not None:
+                process = await self._replace(process)
+
+            process.stdin.write(orjson.dumps({"code": code}) + b"\n")
+            await process.stdin.drain()
+
+            line = await asyncio.wait_for(process.stdout.readline(), self.timeout)
+            if not line:
+                # The interpreter itself went down
+                await process.wait()
+                return False, None, "Interpreter exited while running snippet", process.returncode
+
+            reply = orjson.loads(line)
+            exit_code = int(reply["exit_code"])
+            result = (
+                exit_code == 0,
+                reply["stdout"].strip() or None,
+                reply["stderr"].strip() or None,
+                exit_code
+            )
+            in_sync = True
+            return result
+
+        except asyncio.TimeoutError:
+            return False, None, f"Snippet timed out after {self.timeout}s", -1
+
+        except Exception as e:
+            # Oversized or malformed reply: the stream is out of sync from here on
+            return False, None, f"Interpreter protocol error: {e}", -1
+
+        finally:
+            if not in_sync:
+                process = await self._replace(process)
+            self._idle.put_nowait(process)
+
+    async def close(self):
+        """Terminate all interpreter processes"""
+        for process in list(self._processes):
+            await self._kill(process)
 
 
 class SnippetExecutor:
     """Executes code snippets in sandboxed environments"""
 
-    def __init__(self):
+    def __init__(self, pool_size: int = 4, timeout: float = 30.0):
+        self.timeout = timeout
+        self.sandbox = SnippetSandbox()
+        # Python snippets fork off warm interpreters instead of starting a fresh
+        # process each; the driver applies the memory and per-snippet CPU limits
+        self.python_pool = InterpreterPool(
+            ['python', '-u', '-c', _PYTHON_SNIPPET_DRIVER,
+             str(SNIPPET_MEMORY_LIMIT), str(SNIPPET_CPU_LIMIT)],
+            size=pool_size, timeout=timeout
+        )
+        self._initialized = False
+        self._init_lock = asyncio.Lock()
         self.supported_languages = {
             'python': self._execute_python,
             'javascript': self._execute_javascript,
@@ -419,10 +925,16 @@ class SnippetExecutor:
             'shell': self._execute_bash
         }
 
-    async def execute_snippets(self, docs: List[Dict]) -> List[SnippetResult]:
+    async def execute_snippets(self, docs: List[Dict], max_concurrent: int = 10) -> List[SnippetResult]:
         """Execute code snippets from documentation"""
-        results = []
+        semaphore = asyncio.Semaphore(max_concurrent)
 
+        async def bounded(doc_path: str, block_id: int, language: str,
+                          code: str, line_number: int) -> SnippetResult:
+            async with semaphore:
+                return await self._execute_snippet(doc_path, block_id, language, code, line_number)
+
+        tasks = []
         for doc in docs:
             code_blocks = doc.get('code_blocks', [])
             doc_path = doc.get('path', '')
@@ -436,25 +948,28 @@ class SnippetExecutor:
                 line_number = block.get('line_number', 0)
 
                 if language in self.supported_languages:
-                    result = await self._execute_snippet(
-                        doc_path, i, language, code, line_number
-                    )
-                    results.append(result)
+                    tasks.append(bounded(doc_path, i, language, code, line_number))
                 else:
                     # Unsupported language
-                    results.append(SnippetResult(
-                        id=f"snippet_{doc_path}_{i}",
-                        project_id="",  # Set by caller
-                        doc_path=doc_path,
-                        code_block_id=str(i),
-                        language=language,
-                        code=code,
-                        success=False,
-                        execution_time=0.0,
-                        error_message=f"Unsupported language: {language}"
-                    ))
-
-        return results
+                    tasks.append(self._unsupported_result(doc_path, i, language, code))
+
+        # Snippets are independent, so run them side by side
+        return list(await asyncio.gather(*tasks))
+
+    async def _unsupported_result(self, doc_path: str, block_id: int,
+                                  language: str, code: str) -> SnippetResult:
+        """Result for a snippet in a language we can't execute"""
+        return SnippetResult(
+            id=f"snippet_{doc_path}_{block_id}",
+            project_id="",  # Set by caller
+            doc_path=doc_path,
+            code_block_id=str(block_id),
+            language=language,
+            code=code,
+            success=False,
+            execution_time=0.0,
+            error_message=f"Unsupported language: {language}"
+        )
 
     async def _execute_snippet(self, doc_path: str, block_id: int, language: str,
                              code: str, line_number: int) -> SnippetResult:
@@ -495,73 +1010,71 @@ class SnippetExecutor:
                 error_message=f"Execution failed: {str(e)}"
             )
 
+    async def initialize(self):
+        """Select the sandbox and start the persistent interpreter pool"""
+        async with self._init_lock:
+            if not self._initialized:
+                await self.sandbox.detect()
+                self.python_pool.argv = self.sandbox.wrap(self.python_pool.argv)
+                await self.python_pool.start()
+                self._initialized = True
+
+    async def close(self):
+        """Stop the persistent interpreter pool"""
+        await self.python_pool.close()
+
     async def _execute_python(self, code: str) -> Tuple[bool, Optional[str], Optional[str], Optional[int]]:
         """Execute Python code snippet"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-            f.write(code)
-            temp_file = f.name
-
-        try:
-            process = await asyncio.create_subprocess_exec(
-                'python', temp_file,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-
-            stdout, stderr = await process.communicate()
-
-            success = process.returncode == 0
-            output = stdout.decode().strip() if stdout else None
-            error_msg = stderr.decode().strip() if stderr else None
-
-            return success, output, error_msg, process.returncode
-
-        finally:
-            os.unlink(temp_file)
+        if not self._initialized:
+            await self.initialize()
+        return await self.python_pool.run(code)
 
     async def _execute_javascript(self, code: str) -> Tuple[bool, Optional[str], Optional[str], Optional[int]]:
         """Execute JavaScript code snippet"""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.js', delete=False) as f:
-            f.write(code)
-            temp_file = f.name
-
         try:
-            process = await asyncio.create_subprocess_exec(
-                'node', temp_file,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-
-            stdout, stderr = await process.communicate()
-
-            success = process.returncode == 0
-            output = stdout.decode().strip() if stdout else None
-            error_msg = stderr.decode().strip() if stderr else None
-
-            return success, output, error_msg, process.returncode
-
-        finally:
-            os.unlink(temp_file)
+            return await self._run_sandboxed(['node', '-'], code)
+        except Exception as e:
+            return False, None, str(e), -1
 
     async def _execute_bash(self, code: str) -> Tuple[bool, Optional[str], Optional[str], Optional[int]]:
         """Execute Bash/Shell code snippet"""
         try:
-            process = await asyncio.create_subprocess_exec(
-                'bash', '-c', code,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
+            # Passed as an argument so a snippet reading stdin sees EOF, not its own source
+            return await self._run_sandboxed(['bash', '-c', code])
+        except Exception as e:
+            return False, None, str(e), -1
 
-            stdout, stderr = await process.communicate()
+    async def _run_sandboxed(self, argv: List[str], code: Optional[str] = None
+                             ) -> Tuple[bool, Optional[str], Optional[str], Optional[int]]:
+        """Run a one-off snippet process inside the sandbox, feeding the code (if any) on stdin"""
+        if not self._initialized:
+            await self.initialize()
+
+        process = await asyncio.create_subprocess_exec(
+            *self.sandbox.wrap(argv),
+            stdin=asyncio.subprocess.PIPE if code is not None else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            preexec_fn=_limit_resources(),
+            start_new_session=True
+        )
 
-            success = process.returncode == 0
-            output = stdout.decode().strip() if stdout else None
-            error_msg = stderr.decode().strip() if stderr else None
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(code.encode() if code is not None else None), self.timeout)
+        except asyncio.TimeoutError:
+            # Kill the whole process group, including anything the snippet spawned
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            await process.wait()
+            return False, None, f"Snippet timed out after {self.timeout}s", -1
 
-            return success, output, error_msg, process.returncode
+        success = process.returncode == 0
+        output = stdout.decode().strip() if stdout else None
+        error_msg = stderr.decode().strip() if stderr else None
 
-        except Exception as e:
-            return False, None, str(e), -1
+        return success, output, error_msg, process.returncode
 
 
 class DiffWorker:
@@ -571,11 +1084,19 @@ class DiffWorker:
         self.config = config
         self.redis_client = None
         self.nats_client = None
+        self._stop = asyncio.Event()
 
         # Initialize components
-        self.schema_detector = SchemaDriftDetector()
+        spec_cache_dir = config.get("spec_cache_dir")
+        self.schema_detector = SchemaDriftDetector(
+            cache_dir=Path(spec_cache_dir) if spec_cache_dir else None,
+            disk_cache_max_bytes=config.get("spec_cache_max_mb", 256) * 1024 * 1024
+        )
         self.link_checker = None  # Will be initialized with Redis
-        self.snippet_executor = SnippetExecutor()
+        self.snippet_executor = SnippetExecutor(
+            pool_size=config.get("snippet_workers", 4),
+            timeout=config.get("snippet_timeout", 30.0)
+        )
 
     async def initialize(self):
         """Initialize connections"""
@@ -593,6 +1114,9 @@ class DiffWorker:
         # Initialize link checker with Redis
         self.link_checker = LinkChecker(self.redis_client)
 
+        # Warm up the snippet interpreters
+        await self.snippet_executor.initialize()
+
         logger.info("Diff worker initialized")
 
     async def run(self):
@@ -613,13 +1137,22 @@ class DiffWorker:
             cb=message_handler
         )
 
-        while True:
-            await asyncio.sleep(1)
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, self.stop)
+
+        # Sleep until a shutdown signal arrives
+        await self._stop.wait()
+        logger.info("Received shutdown signal")
+
+    def stop(self):
+        """Ask the worker loop to exit"""
+        self._stop.set()
 
     async def handle_diff_request(self, msg):
         """Handle incoming diff request"""
         try:
-            data = json.loads(msg.data.decode())
+            data = orjson.loads(msg.data)
             request = DiffRequest(**data)
 
             logger.info("Processing diff request",
@@ -643,11 +1176,15 @@ class DiffWorker:
 
             broken_links = []
             if request.check_broken_links:
-                broken_links = await self.link_checker.check_links(docs, request.include_external_links)
+                broken_links = await self.link_checker.check_links(
+                    docs, request.include_external_links, request.max_concurrent_checks
+                )
 
             snippet_results = []
             if request.test_snippets:
-                snippet_results = await self.snippet_executor.execute_snippets(docs)
+                snippet_results = await self.snippet_executor.execute_snippets(
+                    docs, request.max_concurrent_checks
+                )
 
             duration = time.time() - start_time
 
@@ -665,10 +1202,11 @@ class DiffWorker:
                 request_id=request.request_id
             )
 
-            # Publish result
-            result_data = asdict(result)
-            result_subject = "delta.diff.result"
-            await self.nats_client.publish(result_subject, json.dumps(result_data).encode())
+            # Publish result; orjson walks the nested dataclasses itself,
+            # so there is no intermediate deep-copied dict
+            await self.nats_client.publish(
+                _RESULT_SUBJECT, orjson.dumps(result, option=orjson.OPT_NON_STR_KEYS)
+            )
 
             await msg.ack()
 
@@ -683,31 +1221,24 @@ class DiffWorker:
 
     async def _find_spec_files(self, repo_path: str) -> List[Path]:
         """Find API specification files in repository"""
-        repo_dir = Path(repo_path)
-        spec_files = []
-
-        # Common spec file patterns
-        patterns = [
-            "**/*.json",
-            "**/*.yaml",
-            "**/*.yml"
-        ]
-
-        for pattern in patterns:
-            for file_path in repo_dir.glob(pattern):
-                if file_path.is_file():
-                    # Check if it's a spec file
-                    if self._is_spec_file(file_path):
-                        spec_files.append(file_path)
-
-        return spec_files
+        return await asyncio.to_thread(lambda: list(self._walk_spec_files(repo_path)))
 
-    def _is_spec_file(self, file_path: Path) -> bool:
-        """Check if file is an API specification"""
-        name = file_path.name.lower()
-        return any(keyword in name for keyword in [
-            'openapi', 'swagger', 'api', 'schema', 'graphql'
-        ])
+    def _walk_spec_files(self, root: str):
+        """Yield spec files under root in a single directory walk"""
+        stack = [root]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name != '.git':
+                                stack.append(entry.path)
+                        # Suffix test first: most files are rejected without touching the regex
+                        elif (entry.name.lower().endswith(_SPEC_SUFFIXES)
+                              and _SPEC_RE.search(entry.name) and entry.is_file()):
+                            yield Path(entry.path)
+            except OSError as e:
+                logger.warning("Failed to scan directory", error=str(e))
 
     async def _load_entities(self, request: DiffRequest) -> List[Dict]:
         """Load code entities (mock implementation)"""
@@ -732,6 +1263,9 @@ class DiffWorker:
 
     async def shutdown(self):
         """Clean shutdown"""
+        if self.link_checker:
+            await self.link_checker.close()
+        await self.snippet_executor.close()
         if self.nats_client:
             await self.nats_client.close()
         if self.redis_client:
@@ -744,6 +1278,10 @@ async def main():
         "redis_host": os.getenv("REDIS_HOST", "localhost"),
         "redis_port": int(os.getenv("REDIS_PORT", "6379")),
         "nats_url": os.getenv("NATS_URL", "nats://localhost:4222"),
+        "spec_cache_dir": os.getenv("SPEC_CACHE_DIR", "/tmp/ai-docgap/diff-cache"),
+        "spec_cache_max_mb": int(os.getenv("SPEC_CACHE_MAX_MB", "256")),
+        "snippet_workers": int(os.getenv("SNIPPET_WORKERS", "4")),
+        "snippet_timeout": float(os.getenv("SNIPPET_TIMEOUT", "30")),
     }
 
     worker = DiffWorker(config)
@@ -755,6 +1293,15 @@ async def main():
         await worker.shutdown()
         sys.exit(1)
 
+    await worker.shutdown()
+
 
 if __name__ == "__main__":
+    # Prefer uvloop where it is available; it is not supported on Windows
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     asyncio.run(main())
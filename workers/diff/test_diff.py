@@ -0,0 +1,145 @@
+# Diff Worker Tests
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import pytest
+import pytest_asyncio
+
+from main import InterpreterPool, SchemaDriftDetector, SnippetExecutor, SNIPPET_MEMORY_LIMIT, _PYTHON_SNIPPET_DRIVER
+
+
+def _alive(pid: int) -> bool:
+    """True while pid is a running (not zombie) process"""
+    try:
+        status = Path(f"/proc/{pid}/status").read_text()
+    except FileNotFoundError:
+        return False
+    return "\nState:\tZ" not in status
+
+
+async def _wait_gone(pid: int, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while _alive(pid):
+        if time.monotonic() > deadline:
+            return False
+        await asyncio.sleep(0.05)
+    return True
+
+
+class TestInterpreterPool:
+    """Persistent Python interpreters used for snippet execution"""
+
+    @pytest_asyncio.fixture
+    async def pool(self):
+        """Single unsandboxed interpreter with a short timeout"""
+        pool = InterpreterPool(
+            ["python", "-u", "-c", _PYTHON_SNIPPET_DRIVER, str(SNIPPET_MEMORY_LIMIT), "5"],
+            size=1, timeout=1.0
+        )
+        await pool.start()
+        yield pool
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_snippets_do_not_share_state(self, pool):
+        """Globals and monkeypatches from one snippet are gone in the next"""
+        await pool.run("import json\njson.dumps = None\nleaked = 1")
+
+        success, output, _, _ = await pool.run("import json\nprint(json.dumps(globals().get('leaked')))")
+
+        assert success
+        assert output == "null"
+
+    @pytest.mark.asyncio
+    async def test_timeout_replaces_interpreter_and_kills_snippet(self, pool, tmp_path):
+        """A timed-out snippet is killed with its interpreter, and a fresh one takes over"""
+        pid_file = tmp_path / "pid"
+        interpreter = next(iter(pool._processes))
+
+        success, _, error, exit_code = await pool.run(
+            f"import os, time\nopen({str(pid_file)!r}, 'w').write(str(os.getpid()))\ntime.sleep(1000)"
+        )
+
+        assert not success
+        assert "timed out" in error
+        assert exit_code == -1
+        assert await _wait_gone(int(pid_file.read_text()))
+        assert interpreter not in pool._processes
+        assert len(pool._processes) == 1
+        assert (await pool.run("print('alive')"))[1] == "alive"
+
+    @pytest.mark.asyncio
+    async def test_protocol_error_replaces_interpreter(self):
+        """An interpreter whose reply can't be parsed is discarded"""
+        pool = InterpreterPool(
+            ["python", "-u", "-c", "import sys\nfor line in sys.stdin: print('garbage', flush=True)"],
+            size=1, timeout=5.0
+        )
+        await pool.start()
+        try:
+            interpreter = next(iter(pool._processes))
+
+            success, _, error, _ = await pool.run("print(1)")
+
+            assert not success
+            assert "protocol error" in error
+            assert interpreter not in pool._processes
+            assert len(pool._processes) == 1
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_snippet_processes_do_not_outlive_pool(self, pool, tmp_path):
+        """Background processes a snippet leaves behind die when the pool closes"""
+        pid_file = tmp_path / "pid"
+        await pool.run(
+            "import subprocess\n"
+            "p = subprocess.Popen(['sleep', '1000'])\n"
+            f"open({str(pid_file)!r}, 'w').write(str(p.pid))"
+        )
+        pid = int(pid_file.read_text())
+        assert _alive(pid)
+
+        await pool.close()
+
+        assert await _wait_gone(pid)
+
+
+class TestSnippetExecutor:
+    """One-off snippet processes"""
+
+    @pytest.mark.asyncio
+    async def test_bash_snippet_reading_stdin_sees_eof(self):
+        """Bash gets its code as an argument, so `read` can't swallow the script"""
+        executor = SnippetExecutor(pool_size=1, timeout=10.0)
+        try:
+            success, output, _, _ = await executor._execute_bash("read x\necho after\necho done")
+        finally:
+            await executor.close()
+
+        assert success
+        assert output == "after\ndone"
+
+
+class TestSpecDiskCache:
+    """On-disk cache of parsed specs"""
+
+    def test_concurrent_writes_prune_once_per_tenth(self, tmp_path):
+        """Writer threads share one byte counter, and the cache stays within budget"""
+        detector = SchemaDriftDetector(cache_dir=tmp_path, disk_cache_max_bytes=20_000)
+        prunes = []
+        prune = detector._prune_disk_cache
+        detector._prune_disk_cache = lambda: (prunes.append(1), prune())
+        spec = {"openapi": "3.0.0", "padding": "x" * 980}
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda i: detector._write_cached_spec(f"spec-{i}", spec), range(200)))
+
+        entry_size = next(tmp_path.iterdir()).stat().st_size
+        # The first write prunes, then every write that takes the count past 2000 bytes
+        writes_per_prune = -(-2000 // entry_size)
+        assert len(prunes) == 1 + 199 // writes_per_prune
+        # Writes since the last prune may overshoot the budget by up to a tenth
+        assert sum(p.stat().st_size for p in tmp_path.iterdir()) <= 22_000
@@ -18,24 +18,31 @@ Features:
 """
 
 import asyncio
-import json
-import logging
+import functools
+import hashlib
+import io
 import os
-import re
+import signal
 import sys
 import time
-from dataclasses import dataclass, asdict
-from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Any, Set, Tuple
 from datetime import datetime
-from urllib.parse import urlparse
 
-import aiofiles
 import httpx
+import orjson
 from nats.aio.client import Client as NATS
-from nats.aio.errors import ErrTimeout
 import redis.asyncio as redis
 import structlog
+import yaml
+from jinja2 import DictLoader, Environment, Template
+
+# Prefer the libyaml-backed dumper when PyYAML was built with it
+try:
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeDumper
 
 # Configure structured logging
 structlog.configure(
@@ -58,8 +65,11 @@ structlog.configure(
 
 logger = structlog.get_logger()
 
+# Bump whenever templates or draft layout change so cached drafts are not reused
+DRAFT_SCHEMA_VERSION = 3
+
 
-@dataclass
+@dataclass(slots=True)
 class DraftRequest:
     """Draft generation request"""
     project_id: str
@@ -72,12 +82,12 @@ class DraftRequest:
     request_id: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class DraftResult:
     """Draft generation result"""
     project_id: str
-    entity_id: Optional[str] = None
-    doc_path: Optional[str] = None
+    entity_id: Optional[str]
+    doc_path: Optional[str]
     mdx_content: str
     frontmatter: Dict[str, Any]
     diagrams: List[Dict[str, Any]]
@@ -88,7 +98,7 @@ class DraftResult:
     request_id: str = ""
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MDXSection:
     """Represents a section in MDX document"""
     title: str
@@ -97,6 +107,386 @@ class MDXSection:
     anchor: Optional[str] = None
 
 
+# Sections whose content never depends on the entity, built once and shared
+_AUTH_SECTION = MDXSection(
+    title="Authentication",
+    level=2,
+    content="""
+## Authentication
+
+This endpoint requires authentication. Include your API key in the request headers:
+
+```
+Authorization: Bearer YOUR_API_KEY
+```
+""",
+    anchor="authentication"
+)
+
+_ERROR_SECTION = MDXSection(
+    title="Error Handling",
+    level=2,
+    content="""
+## Error Handling
+
+The API uses standard HTTP status codes:
+
+- `200` - Success
+- `400` - Bad Request
+- `401` - Unauthorized
+- `403` - Forbidden
+- `404` - Not Found
+- `500` - Internal Server Error
+
+Error responses include a JSON object with `error` and `message` fields.
+""",
+    anchor="error-handling"
+)
+
+_REQUEST_RESPONSE_SECTION = MDXSection(
+    title="Request & Response",
+    level=2,
+    content="""
+## Request
+
+```http
+GET /api/endpoint HTTP/1.1
+Host: api.example.com
+Authorization: Bearer YOUR_API_KEY
+Content-Type: application/json
+```
+
+## Response
+
+### Success Response (200 OK)
+
+```json
+{
+  "success": true,
+  "data": {
+    "id": "123",
+    "name": "Example Item",
+    "created_at": "2024-01-01T00:00:00Z"
+  }
+}
+```
+
+### Error Response (400 Bad Request)
+
+```json
+{
+  "success": false,
+  "error": "VALIDATION_ERROR",
+  "message": "Invalid request parameters"
+}
+```
+""".strip(),
+    anchor="request-response"
+)
+
+
+# MDX templates, parsed and compiled once at import and rendered per draft
+_TEMPLATES = {
+    "api_overview": """
+# {{ name or 'API Reference' }}
+
+{{ docstring or 'API endpoint for ' ~ (name or 'unknown functionality') }}
+
+## Overview
+
+This API endpoint provides access to {{ name or 'functionality' }}.
+""",
+    "getting_started": """
+# Getting Started with {{ name or 'API' }}
+
+Welcome to the {{ name or 'API' }} getting started guide.
+
+## Prerequisites
+
+Before you begin, ensure you have:
+
+- API credentials
+- Basic understanding of REST APIs
+- A development environment
+
+## Quick Start
+
+Here's a simple example to get you started:
+
+```bash
+curl -X GET "{{ name or 'api-endpoint' }}" \\
+  -H "Authorization: Bearer YOUR_API_KEY"
+```
+
+## Next Steps
+
+1. [API Reference](./api-reference)
+2. [Examples](./examples)
+3. [Troubleshooting](./troubleshooting)
+""",
+    "troubleshooting": """
+# Troubleshooting {{ name or 'API' }}
+
+Common issues and solutions for the {{ name or 'API' }}.
+
+## Common Issues
+
+### Authentication Errors
+
+**Problem**: Receiving 401 Unauthorized errors.
+
+**Solution**:
+- Verify your API key is correct
+- Check that the key is properly included in request headers
+- Ensure the key hasn't expired
+
+### Rate Limiting
+
+**Problem**: Receiving 429 Too Many Requests errors.
+
+**Solution**:
+- Implement exponential backoff
+- Check your current rate limit status
+- Consider upgrading your plan for higher limits
+
+### Data Format Issues
+
+**Problem**: Receiving 400 Bad Request errors.
+
+**Solution**:
+- Validate your request payload format
+- Check required vs optional parameters
+- Review the API specification for correct data types
+""",
+    "examples": """
+# {{ name or 'API' }} Examples
+
+Practical examples for using the {{ name or 'API' }}.
+
+## Basic Usage
+
+```javascript
+// JavaScript example
+const response = await fetch('{{ name or 'api-endpoint' }}', {
+  method: 'GET',
+  headers: {
+    'Authorization': 'Bearer YOUR_API_KEY',
+    'Content-Type': 'application/json'
+  }
+});
+
+const data = await response.json();
+console.log(data);
+```
+
+```python
+# Python example
+import requests
+
+response = requests.get(
+    '{{ name or 'api-endpoint' }}',
+    headers={
+        'Authorization': 'Bearer YOUR_API_KEY'
+    }
+)
+
+data = response.json()
+print(data)
+```
+
+## Advanced Usage
+
+For more complex scenarios, you can:
+
+1. Handle pagination automatically
+2. Implement retry logic
+3. Use streaming responses
+4. Batch multiple requests
+""",
+    "parameters": """
+## Parameters
+
+| Parameter | Type | Required | Description |
+|-----------|------|----------|-------------|
+{{ rows }}
+""",
+    "example_javascript": """
+// JavaScript example for {{ name or 'API' }}
+const apiCall = async () => {
+  try {
+    const response = await fetch('{{ name or 'api-endpoint' }}', {
+      method: 'GET',
+      headers: {
+        'Authorization': 'Bearer YOUR_API_KEY',
+        'Content-Type': 'application/json'
+      }
+    });
+
+    if (!response.ok) {
+      throw new Error(`HTTP error! status: ${response.status}`);
+    }
+
+    const data = await response.json();
+    console.log('API Response:', data);
+    return data;
+  } catch (error) {
+    console.error('API call failed:', error);
+    throw error;
+  }
+};
+
+// Usage
+apiCall().then(data => console.log(data));
+""",
+    "example_python": """
+# Python example for {{ name or 'API' }}
+import requests
+from typing import Dict, Any
+
+def call_api() -> Dict[str, Any]:
+    \"\"\"
+    Call the {{ name or 'API' }} endpoint
+    \"\"\"
+    url = "{{ name or 'api-endpoint' }}"
+    headers = {
+        "Authorization": "Bearer YOUR_API_KEY",
+        "Content-Type": "application/json"
+    }
+
+    try:
+        response = requests.get(url, headers=headers)
+        response.raise_for_status()  # Raise exception for bad status codes
+
+        data = response.json()
+        print(f"API Response: {data}")
+        return data
+
+    except requests.exceptions.RequestException as e:
+        print(f"API call failed: {e}")
+        raise
+
+# Usage
+if __name__ == "__main__":
+    result = call_api()
+    print("Success:", result)
+""",
+    "example_curl": """
+# cURL example for {{ name or 'API' }}
+curl -X GET "{{ name or 'api-endpoint' }}" \\
+  -H "Authorization: Bearer YOUR_API_KEY" \\
+  -H "Content-Type: application/json" \\
+  -v
+""",
+}
+
+_jinja_env = Environment(
+    loader=DictLoader(_TEMPLATES),
+    auto_reload=False,
+    cache_size=-1,
+    trim_blocks=True,
+    lstrip_blocks=True,
+    keep_trailing_newline=True,
+)
+
+# Example templates per requested language: (code fence language, title, template)
+_EXAMPLE_TEMPLATES = {
+    "javascript": ("javascript", "JavaScript Example", "example_javascript"),
+    "python": ("python", "Python Example", "example_python"),
+    "curl": ("bash", "cURL Example", "example_curl"),
+}
+
+
+# Example languages advertised in frontmatter
+_LANGS_DEFAULT = ("javascript", "python", "curl")
+
+_KIND_TAGS = {
+    "endpoint": ("api", "endpoint", "rest"),
+    "function": ("function", "code"),
+    "class": ("class", "object"),
+}
+
+_VISIBILITY_TAGS = {
+    "public": ("public",),
+    "internal": ("internal",),
+}
+
+
+def _template_context(entity: Dict) -> Dict[str, Any]:
+    """Entity fields the templates read, looked up once per render"""
+    return {"name": entity.get("name"), "docstring": entity.get("docstring")}
+
+
+def _normalize_parameter(param: Any) -> Optional[Tuple[Any, Any, str, Any]]:
+    """Reduce a signature parameter to (name, type, required, description)"""
+    if isinstance(param, str):
+        # Simple parameter name
+        return param, "string", "Yes", "Parameter description"
+    if isinstance(param, dict):
+        return (
+            param.get("name", "unknown"),
+            param.get("type", "string"),
+            "Yes" if param.get("required", False) else "No",
+            param.get("description", "Parameter description"),
+        )
+    return None
+
+
+def _parameter_rows(parameters: List[Any]) -> str:
+    """Format the parameters table body in a single join"""
+    rows = filter(None, map(_normalize_parameter, parameters))
+    return "\n".join(f"| {n} | {t} | {r} | {d} |" for n, t, r, d in rows)
+
+
+@functools.lru_cache(maxsize=32)
+def _extract_tags(kind: Optional[str], visibility: Optional[str]) -> Tuple[str, ...]:
+    """Extract relevant tags from an entity's kind and visibility"""
+    return _KIND_TAGS.get(kind, ()) + _VISIBILITY_TAGS.get(visibility, ())
+
+
+# Mermaid diagrams per draft type
+_DIAGRAMS: Dict[str, Tuple[Dict[str, Any], ...]] = {
+    "api_reference": ({
+        "type": "flowchart",
+        "title": "API Flow",
+        "content": """
+```mermaid
+flowchart TD
+    A[Client Request] --> B[Authentication]
+    B --> C{Valid Token?}
+    C -->|Yes| D[Process Request]
+    C -->|No| E[Return 401]
+    D --> F[Business Logic]
+    F --> G[Database Query]
+    G --> H[Format Response]
+    H --> I[Return 200]
+```
+"""
+    },),
+    "getting_started": ({
+        "type": "flowchart",
+        "title": "Getting Started Flow",
+        "content": """
+```mermaid
+flowchart LR
+    A[Sign Up] --> B[Get API Key]
+    B --> C[Make First Request]
+    C --> D[Handle Response]
+    D --> E[Build Integration]
+    E --> F[Go Live]
+```
+"""
+    },),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class _DraftPlan:
+    """The parts of a draft fixed by its type and languages, resolved once per combination"""
+    template_func: Callable[..., List[MDXSection]]
+    diagrams: Tuple[Dict[str, Any], ...]
+    examples: Tuple[Tuple[str, str, Template], ...]  # (fence language, title, template)
+
+
 class MDXGenerator:
     """Generates MDX documentation from code entities"""
 
@@ -107,46 +497,52 @@ class MDXGenerator:
             "troubleshooting": self._generate_troubleshooting,
             "examples": self._generate_examples,
         }
+        self._compiled = {name: _jinja_env.get_template(name) for name in _TEMPLATES}
+        self._plans: Dict[Tuple[str, Tuple[str, ...]], _DraftPlan] = {}
+
+    def _plan(self, draft_type: str, languages: Tuple[str, ...]) -> _DraftPlan:
+        """Resolve template, diagrams and example templates for a draft type and languages"""
+        key = (draft_type, languages)
+        plan = self._plans.get(key)
+        if plan is None:
+            examples = []
+            for language in languages:
+                if language in _EXAMPLE_TEMPLATES:
+                    fence, title, template = _EXAMPLE_TEMPLATES[language]
+                    examples.append((fence, title, self._compiled[template]))
+
+            # Combinations come from requests, so keep the table bounded
+            if len(self._plans) >= 128:
+                self._plans.clear()
+            plan = self._plans[key] = _DraftPlan(
+                template_func=self.templates.get(draft_type, self._generate_api_reference),
+                diagrams=_DIAGRAMS.get(draft_type, ()),
+                examples=tuple(examples)
+            )
+        return plan
 
     def generate_frontmatter(self, entity: Dict, project: Dict, draft_type: str) -> Dict[str, Any]:
         """Generate frontmatter for MDX document"""
+        now_iso = datetime.now().isoformat()
         return {
             "title": entity.get("name", "API Reference"),
-            "description": entity.get("docstring", "").split('.')[0] if entity.get("docstring") else "",
+            "description": (entity.get("docstring") or "").partition(".")[0],
             "sidebar_position": 1,
             "draft_type": draft_type,
             "entity_id": entity.get("id"),
             "project_id": project.get("id"),
-            "generated_at": datetime.now().isoformat(),
-            "last_updated": datetime.now().isoformat(),
-            "tags": self._extract_tags(entity),
+            "generated_at": now_iso,
+            "last_updated": now_iso,
+            "tags": list(_extract_tags(entity.get("kind"), entity.get("visibility"))),
             "api_version": "v1",
-            "languages": ["javascript", "python", "curl"],
+            "languages": list(_LANGS_DEFAULT),
         }
 
-    def _extract_tags(self, entity: Dict) -> List[str]:
-        """Extract relevant tags from entity"""
-        tags = []
-
-        if entity.get("kind") == "endpoint":
-            tags.extend(["api", "endpoint", "rest"])
-        elif entity.get("kind") == "function":
-            tags.extend(["function", "code"])
-        elif entity.get("kind") == "class":
-            tags.extend(["class", "object"])
-
-        if entity.get("visibility") == "public":
-            tags.append("public")
-        elif entity.get("visibility") == "internal":
-            tags.append("internal")
-
-        return tags
-
-    async def generate_draft(self,
-                           entity: Dict,
-                           mappings: List[Dict],
-                           project: Dict,
-                           request: DraftRequest) -> DraftResult:
+    def generate_draft(self,
+                       entity: Dict,
+                       mappings: List[Dict],
+                       project: Dict,
+                       request: DraftRequest) -> DraftResult:
         """Generate complete MDX draft"""
         start_time = time.time()
 
@@ -154,19 +550,19 @@ class MDXGenerator:
             # Generate frontmatter
             frontmatter = self.generate_frontmatter(entity, project, request.draft_type)
 
+            # Everything fixed by draft type and languages is resolved once
+            plan = self._plan(request.draft_type, tuple(request.languages or ("javascript",)))
+
             # Generate content based on type
-            template_func = self.templates.get(request.draft_type, self._generate_api_reference)
-            sections = await template_func(entity, mappings, project, request)
+            sections = plan.template_func(entity, mappings, project, request)
 
             # Generate diagrams if requested
-            diagrams = []
-            if request.include_diagrams:
-                diagrams = await self._generate_diagrams(entity, mappings, request.draft_type)
+            diagrams = list(plan.diagrams) if request.include_diagrams else []
 
             # Generate examples if requested
             examples = []
             if request.include_examples:
-                examples = await self._generate_examples_section(entity, request.languages or ["javascript"])
+                examples = self._generate_examples_section(entity, plan.examples)
 
             # Assemble MDX content
             mdx_content = self._assemble_mdx(frontmatter, sections, diagrams, examples)
@@ -207,120 +603,50 @@ class MDXGenerator:
                 request_id=request.request_id
             )
 
-    async def _generate_api_reference(self,
-                                    entity: Dict,
-                                    mappings: List[Dict],
-                                    project: Dict,
-                                    request: DraftRequest) -> List[MDXSection]:
-        """Generate API reference documentation"""
-        sections = []
-
-        # Overview section
-        overview = f"""
-# {entity.get('name', 'API Reference')}
-
-{entity.get('docstring', 'API endpoint for ' + entity.get('name', 'unknown functionality'))}
-
-## Overview
-
-This API endpoint provides access to {entity.get('name', 'functionality')}.
-"""
-
-        sections.append(MDXSection(
-            title="Overview",
-            level=2,
-            content=overview.strip(),
-            anchor="overview"
-        ))
-
-        # Parameters section (if applicable)
-        if entity.get("kind") == "endpoint" or entity.get("signature"):
-            params_section = await self._generate_parameters_section(entity)
-            if params_section:
-                sections.append(params_section)
-
-        # Request/Response section
-        if entity.get("kind") == "endpoint":
-            req_resp_section = await self._generate_request_response_section(entity)
-            sections.append(req_resp_section)
-
-        # Authentication section
-        auth_section = MDXSection(
-            title="Authentication",
-            level=2,
-            content="""
-## Authentication
-
-This endpoint requires authentication. Include your API key in the request headers:
-
-```
-Authorization: Bearer YOUR_API_KEY
-```
-""",
-            anchor="authentication"
-        )
-        sections.append(auth_section)
-
-        # Error handling section
-        error_section = MDXSection(
-            title="Error Handling",
-            level=2,
-            content="""
-## Error Handling
-
-The API uses standard HTTP status codes:
-
-- `200` - Success
-- `400` - Bad Request
-- `401` - Unauthorized
-- `403` - Forbidden
-- `404` - Not Found
-- `500` - Internal Server Error
-
-Error responses include a JSON object with `error` and `message` fields.
-""",
-            anchor="error-handling"
-        )
-        sections.append(error_section)
-
-        return sections
-
-    async def _generate_getting_started(self,
-                                      entity: Dict,
-                                      mappings: List[Dict],
-                                      project: Dict,
-                                      request: DraftRequest) -> List[MDXSection]:
-        """Generate getting started guide"""
-        sections = []
-
-        content = f"""
-# Getting Started with {entity.get('name', 'API')}
-
-Welcome to the {entity.get('name', 'API')} getting started guide.
+    def _generate_api_reference(self,
+                              entity: Dict,
+                              mappings: List[Dict],
+                              project: Dict,
+                              request: DraftRequest) -> List[MDXSection]:
+        """Generate API reference documentation"""
+        sections = []
 
-## Prerequisites
+        # Overview section
+        kind = entity.get("kind")
+        overview = self._compiled["api_overview"].render(_template_context(entity))
 
-Before you begin, ensure you have:
+        sections.append(MDXSection(
+            title="Overview",
+            level=2,
+            content=overview.strip(),
+            anchor="overview"
+        ))
 
-- API credentials
-- Basic understanding of REST APIs
-- A development environment
+        # Parameters section (if applicable)
+        if kind == "endpoint" or entity.get("signature"):
+            params_section = self._generate_parameters_section(entity)
+            if params_section:
+                sections.append(params_section)
 
-## Quick Start
+        # Request/Response section
+        if kind == "endpoint":
+            sections.append(_REQUEST_RESPONSE_SECTION)
 
-Here's a simple example to get you started:
+        # Static sections shared by every API reference
+        sections.append(_AUTH_SECTION)
+        sections.append(_ERROR_SECTION)
 
-```bash
-curl -X GET "{entity.get('name', 'api-endpoint')}" \\
-  -H "Authorization: Bearer YOUR_API_KEY"
-```
+        return sections
 
-## Next Steps
+    def _generate_getting_started(self,
+                                entity: Dict,
+                                mappings: List[Dict],
+                                project: Dict,
+                                request: DraftRequest) -> List[MDXSection]:
+        """Generate getting started guide"""
+        sections = []
 
-1. [API Reference](./api-reference)
-2. [Examples](./examples)
-3. [Troubleshooting](./troubleshooting)
-"""
+        content = self._compiled["getting_started"].render(_template_context(entity))
 
         sections.append(MDXSection(
             title="Getting Started",
@@ -331,48 +657,15 @@ curl -X GET "{entity.get('name', 'api-endpoint')}" \\
 
         return sections
 
-    async def _generate_troubleshooting(self,
-                                      entity: Dict,
-                                      mappings: List[Dict],
-                                      project: Dict,
-                                      request: DraftRequest) -> List[MDXSection]:
+    def _generate_troubleshooting(self,
+                                entity: Dict,
+                                mappings: List[Dict],
+                                project: Dict,
+                                request: DraftRequest) -> List[MDXSection]:
         """Generate troubleshooting guide"""
         sections = []
 
-        content = f"""
-# Troubleshooting {entity.get('name', 'API')}
-
-Common issues and solutions for the {entity.get('name', 'API')}.
-
-## Common Issues
-
-### Authentication Errors
-
-**Problem**: Receiving 401 Unauthorized errors.
-
-**Solution**:
-- Verify your API key is correct
-- Check that the key is properly included in request headers
-- Ensure the key hasn't expired
-
-### Rate Limiting
-
-**Problem**: Receiving 429 Too Many Requests errors.
-
-**Solution**:
-- Implement exponential backoff
-- Check your current rate limit status
-- Consider upgrading your plan for higher limits
-
-### Data Format Issues
-
-**Problem**: Receiving 400 Bad Request errors.
-
-**Solution**:
-- Validate your request payload format
-- Check required vs optional parameters
-- Review the API specification for correct data types
-"""
+        content = self._compiled["troubleshooting"].render(_template_context(entity))
 
         sections.append(MDXSection(
             title="Troubleshooting",
@@ -383,59 +676,15 @@ Common issues and solutions for the {entity.get('name', 'API')}.
 
         return sections
 
-    async def _generate_examples(self,
-                               entity: Dict,
-                               mappings: List[Dict],
-                               project: Dict,
-                               request: DraftRequest) -> List[MDXSection]:
+    def _generate_examples(self,
+                         entity: Dict,
+                         mappings: List[Dict],
+                         project: Dict,
+                         request: DraftRequest) -> List[MDXSection]:
         """Generate examples section"""
         sections = []
 
-        content = f"""
-# {entity.get('name', 'API')} Examples
-
-Practical examples for using the {entity.get('name', 'API')}.
-
-## Basic Usage
-
-```javascript
-// JavaScript example
-const response = await fetch('{entity.get('name', 'api-endpoint')}', {{
-  method: 'GET',
-  headers: {{
-    'Authorization': 'Bearer YOUR_API_KEY',
-    'Content-Type': 'application/json'
-  }}
-}});
-
-const data = await response.json();
-console.log(data);
-```
-
-```python
-# Python example
-import requests
-
-response = requests.get(
-    '{entity.get('name', 'api-endpoint')}',
-    headers={{
-        'Authorization': 'Bearer YOUR_API_KEY'
-    }}
-)
-
-data = response.json()
-print(data)
-```
-
-## Advanced Usage
-
-For more complex scenarios, you can:
-
-1. Handle pagination automatically
-2. Implement retry logic
-3. Use streaming responses
-4. Batch multiple requests
-"""
+        content = self._compiled["examples"].render(_template_context(entity))
 
         sections.append(MDXSection(
             title="Examples",
@@ -446,7 +695,7 @@ For more complex scenarios, you can:
 
         return sections
 
-    async def _generate_parameters_section(self, entity: Dict) -> Optional[MDXSection]:
+    def _generate_parameters_section(self, entity: Dict) -> Optional[MDXSection]:
         """Generate parameters table section"""
         signature = entity.get("signature", {})
         parameters = signature.get("parameters", [])
@@ -454,28 +703,7 @@ For more complex scenarios, you can:
         if not parameters:
             return None
 
-        # Create markdown table
-        table_rows = [
-            "| Parameter | Type | Required | Description |",
-            "|-----------|------|----------|-------------|"
-        ]
-
-        for param in parameters:
-            if isinstance(param, str):
-                # Simple parameter name
-                table_rows.append(f"| {param} | string | Yes | Parameter description |")
-            elif isinstance(param, dict):
-                name = param.get("name", "unknown")
-                param_type = param.get("type", "string")
-                required = "Yes" if param.get("required", False) else "No"
-                desc = param.get("description", "Parameter description")
-                table_rows.append(f"| {name} | {param_type} | {required} | {desc} |")
-
-        content = f"""
-## Parameters
-
-{"\\n".join(table_rows)}
-"""
+        content = self._compiled["parameters"].render(rows=_parameter_rows(parameters))
 
         return MDXSection(
             title="Parameters",
@@ -484,195 +712,15 @@ For more complex scenarios, you can:
             anchor="parameters"
         )
 
-    async def _generate_request_response_section(self, entity: Dict) -> MDXSection:
-        """Generate request/response examples section"""
-        content = """
-## Request
-
-```http
-GET /api/endpoint HTTP/1.1
-Host: api.example.com
-Authorization: Bearer YOUR_API_KEY
-Content-Type: application/json
-```
-
-## Response
-
-### Success Response (200 OK)
-
-```json
-{
-  "success": true,
-  "data": {
-    "id": "123",
-    "name": "Example Item",
-    "created_at": "2024-01-01T00:00:00Z"
-  }
-}
-```
-
-### Error Response (400 Bad Request)
-
-```json
-{
-  "success": false,
-  "error": "VALIDATION_ERROR",
-  "message": "Invalid request parameters"
-}
-```
-"""
-
-        return MDXSection(
-            title="Request & Response",
-            level=2,
-            content=content.strip(),
-            anchor="request-response"
-        )
-
-    async def _generate_diagrams(self,
-                               entity: Dict,
-                               mappings: List[Dict],
-                               draft_type: str) -> List[Dict[str, Any]]:
-        """Generate Mermaid diagrams"""
-        diagrams = []
-
-        if draft_type == "api_reference":
-            # API flow diagram
-            diagram = {
-                "type": "flowchart",
-                "title": "API Flow",
-                "content": """
-```mermaid
-flowchart TD
-    A[Client Request] --> B[Authentication]
-    B --> C{Valid Token?}
-    C -->|Yes| D[Process Request]
-    C -->|No| E[Return 401]
-    D --> F[Business Logic]
-    F --> G[Database Query]
-    G --> H[Format Response]
-    H --> I[Return 200]
-```
-"""
-            }
-            diagrams.append(diagram)
-
-        elif draft_type == "getting_started":
-            # Getting started flow
-            diagram = {
-                "type": "flowchart",
-                "title": "Getting Started Flow",
-                "content": """
-```mermaid
-flowchart LR
-    A[Sign Up] --> B[Get API Key]
-    B --> C[Make First Request]
-    C --> D[Handle Response]
-    D --> E[Build Integration]
-    E --> F[Go Live]
-```
-"""
-            }
-            diagrams.append(diagram)
-
-        return diagrams
-
-    async def _generate_examples_section(self,
-                                       entity: Dict,
-                                       languages: List[str]) -> List[Dict[str, Any]]:
+    def _generate_examples_section(self,
+                                 entity: Dict,
+                                 templates: Tuple[Tuple[str, str, Template], ...]) -> List[Dict[str, Any]]:
         """Generate code examples in multiple languages"""
-        examples = []
-
-        for language in languages:
-            if language == "javascript":
-                example = {
-                    "language": "javascript",
-                    "title": "JavaScript Example",
-                    "code": f"""
-// JavaScript example for {entity.get('name', 'API')}
-const apiCall = async () => {{
-  try {{
-    const response = await fetch('{entity.get('name', 'api-endpoint')}', {{
-      method: 'GET',
-      headers: {{
-        'Authorization': 'Bearer YOUR_API_KEY',
-        'Content-Type': 'application/json'
-      }}
-    }});
-
-    if (!response.ok) {{
-      throw new Error(`HTTP error! status: ${{response.status}}`);
-    }}
-
-    const data = await response.json();
-    console.log('API Response:', data);
-    return data;
-  }} catch (error) {{
-    console.error('API call failed:', error);
-    throw error;
-  }}
-}};
-
-// Usage
-apiCall().then(data => console.log(data));
-"""
-                }
-                examples.append(example)
-
-            elif language == "python":
-                example = {
-                    "language": "python",
-                    "title": "Python Example",
-                    "code": f"""
-# Python example for {entity.get('name', 'API')}
-import requests
-from typing import Dict, Any
-
-def call_api() -> Dict[str, Any]:
-    \"\"\"
-    Call the {entity.get('name', 'API')} endpoint
-    \"\"\"
-    url = "{entity.get('name', 'api-endpoint')}"
-    headers = {{
-        "Authorization": "Bearer YOUR_API_KEY",
-        "Content-Type": "application/json"
-    }}
-
-    try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()  # Raise exception for bad status codes
-
-        data = response.json()
-        print(f"API Response: {{data}}")
-        return data
-
-    except requests.exceptions.RequestException as e:
-        print(f"API call failed: {{e}}")
-        raise
-
-# Usage
-if __name__ == "__main__":
-    result = call_api()
-    print("Success:", result)
-"""
-                }
-                examples.append(example)
-
-            elif language == "curl":
-                example = {
-                    "language": "bash",
-                    "title": "cURL Example",
-                    "code": f"""
-# cURL example for {entity.get('name', 'API')}
-curl -X GET "{entity.get('name', 'api-endpoint')}" \\
-  -H "Authorization: Bearer YOUR_API_KEY" \\
-  -H "Content-Type: application/json" \\
-  -v
-"""
-                }
-                examples.append(example)
-
-        return examples
+        context = _template_context(entity)
+        return [
+            {"language": fence, "title": title, "code": template.render(context)}
+            for fence, title, template in templates
+        ]
 
     def _assemble_mdx(self,
                     frontmatter: Dict[str, Any],
@@ -680,55 +728,86 @@ curl -X GET "{entity.get('name', 'api-endpoint')}" \\
                     diagrams: List[Dict[str, Any]],
                     examples: List[Dict[str, Any]]) -> str:
         """Assemble complete MDX document"""
-        lines = []
+        buf = io.StringIO()
+        write = buf.write
 
         # Frontmatter
         if frontmatter:
-            lines.append("---")
-            for key, value in frontmatter.items():
-                if isinstance(value, list):
-                    lines.append(f"{key}:")
-                    for item in value:
-                        lines.append(f"  - {item}")
-                else:
-                    lines.append(f"{key}: {value}")
-            lines.append("---")
-            lines.append("")
+            write("---\n")
+            write(yaml.dump(frontmatter, Dumper=SafeDumper, sort_keys=False, allow_unicode=True))
+            write("---\n\n")
 
         # Sections
         for section in sections:
             # Add heading
-            lines.append("#" * section.level + " " + section.title)
-            lines.append("")
+            write(f"{'#' * section.level} {section.title}\n\n")
 
             # Add content
             if section.content:
-                lines.append(section.content)
-                lines.append("")
+                write(f"{section.content}\n\n")
 
         # Diagrams
         if diagrams:
-            lines.append("## Diagrams")
-            lines.append("")
+            write("## Diagrams\n\n")
             for diagram in diagrams:
-                lines.append(f"### {diagram['title']}")
-                lines.append("")
-                lines.append(diagram['content'])
-                lines.append("")
+                write(f"### {diagram['title']}\n\n{diagram['content']}\n\n")
 
         # Examples
         if examples:
-            lines.append("## Code Examples")
-            lines.append("")
+            write("## Code Examples\n\n")
             for example in examples:
-                lines.append(f"### {example['title']}")
-                lines.append("")
-                lines.append(f"```{example['language']}")
-                lines.append(example['code'].strip())
-                lines.append("```")
-                lines.append("")
+                write(f"### {example['title']}\n\n")
+                write(f"```{example['language']}\n{example['code'].strip()}\n```\n\n")
+
+        # Every block ends in a blank line; drafts end with a single newline
+        return buf.getvalue()[:-1]
+
+
+# Per-process generator used by render_draft
+_generator: Optional[MDXGenerator] = None
 
-        return "\n".join(lines)
+
+def render_draft(entity: Dict, mappings: List[Dict], project: Dict,
+                 request: DraftRequest) -> DraftResult:
+    """Render a draft; top-level so it can run in a worker process"""
+    global _generator
+    if _generator is None:
+        _generator = MDXGenerator()
+    return _generator.generate_draft(entity, mappings, project, request)
+
+
+def _encode_draft_body(result: DraftResult) -> bytes:
+    """Encode the rendered parts of a draft, shared by the cache and the result message"""
+    return orjson.dumps({
+        "mdx_content": result.mdx_content,
+        "frontmatter": result.frontmatter,
+        "diagrams": result.diagrams,
+        "examples": result.examples,
+    }, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _restamp_draft_body(body: bytes) -> bytes:
+    """Move a cached draft's generation time to now, in the frontmatter and the MDX"""
+    stamp = orjson.loads(body)["frontmatter"].get("generated_at")
+    if not stamp:
+        return body
+    # generated_at and last_updated share one stamp, written verbatim in both places
+    return body.replace(stamp.encode(), datetime.now().isoformat().encode())
+
+
+def _result_payload(body: bytes, request: DraftRequest, duration: float) -> bytes:
+    """Build a result message around an encoded draft body without re-encoding it"""
+    envelope = orjson.dumps({
+        "project_id": request.project_id,
+        "entity_id": request.entity_id,
+        "doc_path": request.doc_path,
+        "success": True,
+        "error_message": None,
+        "draft_duration": duration,
+        "request_id": request.request_id,
+    })
+    # Both are JSON objects: join their members into one
+    return b"".join((body[:-1], b",", envelope[1:]))
 
 
 class DraftWorker:
@@ -736,16 +815,39 @@ class DraftWorker:
 
     def __init__(self, config: Dict):
         self.config = config
+        self.redis_pool = None
         self.redis_client = None
         self.nats_client = None
-        self.mdx_generator = MDXGenerator()
+        self.http_client = None
+        # RedisBloom filter of known entity ids, populated when entities are indexed
+        self.entity_filter = config.get("entity_filter")
+        # Rendering is pure CPU, so it runs in worker processes off the event loop
+        self.render_pool = None
+        # NATS intake only enqueues; consumers drain the queue in batches so
+        # backing-store lookups can be shared across requests
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=config.get("queue_size", 1024))
+        self._consumers: List[asyncio.Task] = []
+        self._batch_size = config.get("batch_size", 16)
+        self._stop = asyncio.Event()
 
     async def initialize(self):
         """Initialize connections"""
-        self.redis_client = redis.Redis(
+        self.redis_pool = redis.ConnectionPool(
             host=self.config.get("redis_host", "localhost"),
             port=self.config.get("redis_port", 6379),
-            decode_responses=True
+            max_connections=self.config.get("redis_pool_size", 50)
+        )
+        self.redis_client = redis.Redis(connection_pool=self.redis_pool)
+
+        if self.entity_filter:
+            await self._ensure_entity_filter()
+
+        # Shared HTTP client so entity/project lookups reuse connections
+        self.http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            timeout=10,
+            headers={"User-Agent": "docgap-draft/1"}
         )
 
         self.nats_client = NATS()
@@ -753,6 +855,15 @@ class DraftWorker:
             self.config.get("nats_url", "nats://localhost:4222")
         )
 
+        render_workers = self.config.get("render_workers", os.cpu_count())
+        if render_workers:
+            self.render_pool = ProcessPoolExecutor(max_workers=render_workers)
+
+        self._consumers = [
+            asyncio.create_task(self._consume())
+            for _ in range(self.config.get("consumers", 4))
+        ]
+
         logger.info("Draft worker initialized")
 
     async def run(self):
@@ -765,7 +876,8 @@ class DraftWorker:
         logger.info("Subscribing to draft requests", subject=subject, queue=queue_group)
 
         async def message_handler(msg):
-            await self.handle_draft_request(msg)
+            # Blocks only when the queue is full, which applies backpressure
+            await self._queue.put(msg)
 
         await self.nats_client.subscribe(
             subject,
@@ -773,44 +885,221 @@ class DraftWorker:
             cb=message_handler
         )
 
-        while True:
-            await asyncio.sleep(1)
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, self.stop)
+
+        # Sleep until a shutdown signal arrives
+        await self._stop.wait()
+        logger.info("Received shutdown signal")
+
+    def stop(self):
+        """Ask the worker loop to exit"""
+        self._stop.set()
 
-    async def handle_draft_request(self, msg):
-        """Handle incoming draft request"""
+    async def _ensure_entity_filter(self):
+        """Reserve the entity bloom filter, or disable it when RedisBloom is unavailable"""
         try:
-            data = json.loads(msg.data.decode())
-            request = DraftRequest(**data)
+            await self.redis_client.bf().create(
+                self.entity_filter,
+                self.config.get("entity_filter_error_rate", 0.001),
+                self.config.get("entity_filter_capacity", 1_000_000)
+            )
+        except redis.ResponseError as e:
+            if "exists" not in str(e).lower():
+                logger.warning("Entity bloom filter unavailable", error=str(e))
+                self.entity_filter = None
+
+    async def _consume(self):
+        """Drain queued requests, taking whatever is already waiting as one batch"""
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self._batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            try:
+                await self.handle_draft_batch(batch)
+            except Exception as e:
+                logger.error("Failed to process draft batch", error=str(e))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def handle_draft_batch(self, msgs: List[Any]):
+        """Fetch data for a batch of draft requests at once, then draft them concurrently"""
+        requests = []
+        for msg in msgs:
+            try:
+                requests.append((msg, DraftRequest(**orjson.loads(msg.data))))
+            except Exception as e:
+                logger.error("Failed to process draft request", error=str(e))
+
+        if not requests:
+            return
+
+        # One lookup per distinct id across the whole batch (mock for now),
+        # with the three fetches overlapping
+        entities, mappings, projects = await asyncio.gather(
+            self._get_entities_data({r.entity_id for _, r in requests}),
+            self._get_mappings_batch({(r.project_id, r.entity_id) for _, r in requests}),
+            self._get_projects_data({r.project_id for _, r in requests})
+        )
 
+        await asyncio.gather(*(
+            self.handle_draft_request(
+                msg, request,
+                entities.get(request.entity_id),
+                mappings[(request.project_id, request.entity_id)],
+                projects[request.project_id]
+            )
+            for msg, request in requests
+        ))
+
+    async def handle_draft_request(self, msg, request: DraftRequest, entity: Optional[Dict],
+                                   mappings: List[Dict], project: Dict):
+        """Generate and publish a single draft"""
+        try:
             logger.info("Processing draft request",
                        project_id=request.project_id,
                        entity_id=request.entity_id,
                        draft_type=request.draft_type,
                        request_id=request.request_id)
 
-            # Get entity and project data (mock for now)
-            entity = await self._get_entity_data(request.entity_id)
-            mappings = await self._get_mappings_data(request.project_id, request.entity_id)
-            project = await self._get_project_data(request.project_id)
-
-            # Generate draft
-            result = await self.mdx_generator.generate_draft(entity, mappings, project, request)
+            if entity is None:
+                await self._publish_not_found(msg, request)
+                return
+
+            # Reuse a cached draft when nothing that feeds the templates changed.
+            # The draft body stays encoded JSON from render to publish, so the
+            # MDX content is encoded exactly once
+            cache_key = self._draft_cache_key(entity, mappings, project, request)
+            body = await self._get_cached_draft(cache_key)
+            success = True
+            if body is not None:
+                payload = _result_payload(_restamp_draft_body(body), request, 0.0)
+            else:
+                result = await self._render(entity, mappings, project, request)
+                success = result.success
+                if success:
+                    body = _encode_draft_body(result)
+                    await self._cache_draft(cache_key, body)
+                    payload = _result_payload(body, request, result.draft_duration)
+                else:
+                    payload = orjson.dumps(result, option=orjson.OPT_NON_STR_KEYS)
 
             # Publish result
-            result_data = asdict(result)
             result_subject = "docs.draft.result"
-            await self.nats_client.publish(result_subject, json.dumps(result_data).encode())
+            await self.nats_client.publish(result_subject, payload)
 
             await msg.ack()
 
             logger.info("Draft request processed",
                        project_id=request.project_id,
-                       success=result.success,
-                       content_length=len(result.mdx_content))
+                       success=success,
+                       cached=body is not None and success,
+                       payload_size=len(payload))
 
         except Exception as e:
             logger.error("Failed to process draft request", error=str(e))
 
+    async def _publish_not_found(self, msg, request: DraftRequest):
+        """Report a request whose entity does not exist"""
+        result = DraftResult(
+            project_id=request.project_id,
+            entity_id=request.entity_id,
+            doc_path=request.doc_path,
+            mdx_content="",
+            frontmatter={},
+            diagrams=[],
+            examples=[],
+            success=False,
+            error_message=f"Entity not found: {request.entity_id}",
+            request_id=request.request_id
+        )
+        await self.nats_client.publish("docs.draft.result", orjson.dumps(result))
+        await msg.ack()
+
+        logger.info("Draft request skipped, entity not found",
+                   project_id=request.project_id,
+                   entity_id=request.entity_id)
+
+    async def _render(self, entity: Dict, mappings: List[Dict], project: Dict,
+                      request: DraftRequest) -> DraftResult:
+        """Render a draft in the process pool, or inline when the pool is disabled"""
+        if not self.render_pool:
+            return render_draft(entity, mappings, project, request)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.render_pool, render_draft, entity, mappings, project, request
+        )
+
+    def _draft_cache_key(self, entity: Dict, mappings: List[Dict], project: Dict,
+                         request: DraftRequest) -> str:
+        """Cache key over every input that affects the rendered draft"""
+        inputs = orjson.dumps({
+            "entity": entity,
+            "mappings": mappings,
+            "project": project,
+            "draft_type": request.draft_type,
+            "include_examples": request.include_examples,
+            "include_diagrams": request.include_diagrams,
+            "languages": request.languages,
+        }, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str)
+        digest = hashlib.blake2b(inputs, digest_size=16).hexdigest()
+        return f"draft:v{DRAFT_SCHEMA_VERSION}:{digest}"
+
+    async def _get_cached_draft(self, cache_key: str) -> Optional[bytes]:
+        """Encoded draft body from the cache, if there is one"""
+        try:
+            return await self.redis_client.get(cache_key)
+        except redis.RedisError as e:
+            logger.warning("Draft cache lookup failed", error=str(e))
+            return None
+
+    async def _cache_draft(self, cache_key: str, body: bytes):
+        """Store the encoded body of a successful draft"""
+        try:
+            await self.redis_client.set(
+                cache_key, body, ex=self.config.get("draft_cache_ttl", 86400)
+            )
+        except redis.RedisError as e:
+            logger.warning("Failed to cache draft", error=str(e))
+
+    async def _get_entities_data(self, entity_ids: Set[Optional[str]]) -> Dict[Optional[str], Dict[str, Any]]:
+        """Get entity data for a batch of ids (mock implementation); unknown ids are left out"""
+        entity_ids = list(await self._filter_known_entities(entity_ids))
+        found = await asyncio.gather(*map(self._get_entity_data, entity_ids))
+        return dict(zip(entity_ids, found))
+
+    async def _filter_known_entities(self, entity_ids: Set[Optional[str]]) -> Set[Optional[str]]:
+        """Drop ids the bloom filter has never seen, in one round trip for the batch"""
+        ids = [entity_id for entity_id in entity_ids if entity_id]
+        if not self.entity_filter or not ids:
+            return entity_ids
+
+        try:
+            exists = await self.redis_client.bf().mexists(self.entity_filter, *ids)
+        except redis.RedisError as e:
+            # Without the filter every id has to be looked up
+            logger.warning("Entity bloom filter check failed", error=str(e))
+            return entity_ids
+
+        missing = {entity_id for entity_id, seen in zip(ids, exists) if not seen}
+        return entity_ids - missing
+
+    async def _get_mappings_batch(self, keys: Set[Tuple[str, Optional[str]]]
+                                  ) -> Dict[Tuple[str, Optional[str]], List[Dict[str, Any]]]:
+        """Get mappings for a batch of (project_id, entity_id) pairs (mock implementation)"""
+        keys = list(keys)
+        found = await asyncio.gather(*(self._get_mappings_data(*key) for key in keys))
+        return dict(zip(keys, found))
+
+    async def _get_projects_data(self, project_ids: Set[str]) -> Dict[str, Dict[str, Any]]:
+        """Get project data for a batch of ids (mock implementation)"""
+        project_ids = list(project_ids)
+        found = await asyncio.gather(*map(self._get_project_data, project_ids))
+        return dict(zip(project_ids, found))
+
     async def _get_entity_data(self, entity_id: Optional[str]) -> Dict[str, Any]:
         """Get entity data (mock implementation)"""
         return {
@@ -851,10 +1140,22 @@ class DraftWorker:
 
     async def shutdown(self):
         """Clean shutdown"""
+        # Let queued drafts finish publishing before closing connections
+        if self._consumers:
+            await self._queue.join()
+            for consumer in self._consumers:
+                consumer.cancel()
+            await asyncio.gather(*self._consumers, return_exceptions=True)
         if self.nats_client:
             await self.nats_client.close()
         if self.redis_client:
             await self.redis_client.close()
+        if self.redis_pool:
+            await self.redis_pool.disconnect()
+        if self.http_client:
+            await self.http_client.aclose()
+        if self.render_pool:
+            self.render_pool.shutdown()
 
 
 async def main():
@@ -863,6 +1164,13 @@ async def main():
         "redis_host": os.getenv("REDIS_HOST", "localhost"),
         "redis_port": int(os.getenv("REDIS_PORT", "6379")),
         "nats_url": os.getenv("NATS_URL", "nats://localhost:4222"),
+        "redis_pool_size": int(os.getenv("REDIS_POOL_SIZE", "50")),
+        "entity_filter": os.getenv("ENTITY_BLOOM_FILTER"),
+        "render_workers": int(os.getenv("RENDER_WORKERS", str(os.cpu_count() or 1))),
+        "queue_size": int(os.getenv("DRAFT_QUEUE_SIZE", "1024")),
+        "consumers": int(os.getenv("DRAFT_CONSUMERS", "4")),
+        "batch_size": int(os.getenv("DRAFT_BATCH_SIZE", "16")),
+        "draft_cache_ttl": int(os.getenv("DRAFT_CACHE_TTL", "86400")),
     }
 
     worker = DraftWorker(config)
@@ -874,6 +1182,8 @@ async def main():
         await worker.shutdown()
         sys.exit(1)
 
+    await worker.shutdown()
+
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,109 @@
+# Draft Worker Tests
+
+import json
+import time
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+import redis.asyncio as redis
+
+from main import DraftWorker, _encode_draft_body, render_draft, DraftRequest
+
+
+def _message(**fields) -> MagicMock:
+    msg = MagicMock()
+    msg.data = json.dumps({"project_id": "p", "request_id": "r1", **fields}).encode()
+    msg.ack = AsyncMock()
+    return msg
+
+
+def _published(worker: DraftWorker) -> list:
+    return [json.loads(call.args[1]) for call in worker.nats_client.publish.call_args_list]
+
+
+class TestDraftCache:
+    """Reuse of rendered drafts across identical requests"""
+
+    @pytest.fixture
+    def worker(self):
+        """DraftWorker with mocked Redis and NATS clients and inline rendering"""
+        worker = DraftWorker({})
+        worker.redis_client = AsyncMock()
+        worker.redis_client.get.return_value = None
+        worker.nats_client = AsyncMock()
+        return worker
+
+    @pytest.mark.asyncio
+    async def test_cache_miss_renders_and_caches(self, worker):
+        """A fresh draft is rendered, cached under its input key and published"""
+        await worker.handle_draft_batch([_message(entity_id="e1")])
+
+        cache_key, body = worker.redis_client.set.call_args.args
+        assert cache_key.startswith("draft:v")
+        [result] = _published(worker)
+        assert result["success"] is True
+        assert result["mdx_content"] == json.loads(body)["mdx_content"]
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_is_restamped(self, worker):
+        """A cached draft is published without rendering, stamped with the current time"""
+        entity = await worker._get_entity_data("e1")
+        request = DraftRequest(project_id="p", entity_id="e1")
+        cached = render_draft(entity, [], {"id": "p"}, request)
+        stale = cached.frontmatter["generated_at"]
+        worker.redis_client.get.return_value = _encode_draft_body(cached)
+        worker._render = AsyncMock()
+        time.sleep(0.01)
+
+        await worker.handle_draft_batch([_message(entity_id="e1")])
+
+        worker._render.assert_not_awaited()
+        worker.redis_client.set.assert_not_awaited()
+        [result] = _published(worker)
+        fresh = result["frontmatter"]["generated_at"]
+        assert fresh > stale
+        assert result["frontmatter"]["last_updated"] == fresh
+        assert stale not in result["mdx_content"]
+        assert f"generated_at: '{fresh}'" in result["mdx_content"]
+
+
+class TestEntityFilter:
+    """Bloom filter screening of entity ids before lookups"""
+
+    @pytest.fixture
+    def worker(self):
+        """DraftWorker whose Redis has an entity bloom filter"""
+        worker = DraftWorker({"entity_filter": "entities"})
+        worker.redis_client = MagicMock()
+        worker.redis_client.get = AsyncMock(return_value=None)
+        worker.redis_client.set = AsyncMock()
+        worker.nats_client = AsyncMock()
+        return worker
+
+    @pytest.mark.asyncio
+    async def test_unknown_entities_are_reported_without_lookup(self, worker):
+        """Ids the filter has never seen get a not-found result; the rest are drafted"""
+        bloom = worker.redis_client.bf.return_value
+        bloom.mexists = AsyncMock(side_effect=lambda _, *ids: [i == "known" for i in ids])
+        worker._get_entity_data = AsyncMock(wraps=worker._get_entity_data)
+        msgs = [_message(entity_id="known"), _message(entity_id="unknown", request_id="r2")]
+
+        await worker.handle_draft_batch(msgs)
+
+        assert bloom.mexists.await_count == 1
+        worker._get_entity_data.assert_awaited_once_with("known")
+        results = {r["entity_id"]: r for r in _published(worker)}
+        assert results["known"]["success"] is True
+        assert results["unknown"]["success"] is False
+        assert "Entity not found" in results["unknown"]["error_message"]
+        for msg in msgs:
+            msg.ack.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_filter_errors_fall_back_to_lookups(self, worker):
+        """When the filter can't be queried every id is looked up"""
+        worker.redis_client.bf.return_value.mexists = AsyncMock(side_effect=redis.RedisError("unknown command"))
+
+        known = await worker._filter_known_entities({"a", "b", None})
+
+        assert known == {"a", "b", None}
@@ -17,32 +17,43 @@ Features:
 """
 
 import asyncio
-import json
-import logging
+import functools
+import hashlib
+import heapq
+import io
 import os
+import posixpath
 import re
+import secrets
 import sys
 import time
+import shutil
+import signal
+import string
 import tempfile
 import subprocess
-from dataclasses import dataclass, asdict
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Any, Awaitable, BinaryIO, Callable, Dict, List, Optional, Set, Tuple, Union
 from datetime import datetime, timezone
 from urllib.parse import urlparse
 
-import aiofiles
+import aioboto3
 import httpx
+import orjson
 from nats.aio.client import Client as NATS
-from nats.aio.errors import ErrTimeout
 import redis.asyncio as redis
 import structlog
-import yaml
+import zstandard as zstd
+from botocore.config import Config as BotoConfig
+from botocore.exceptions import ClientError
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
 
 # Configure structured logging
 structlog.configure(
@@ -107,20 +118,87 @@ class PRDetails:
     reviewers: List[str]
 
 
+class AsyncTokenBucket:
+    """Token bucket shared by concurrent API callers"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._resume_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def defer(self, seconds: float):
+        """Hold every caller back for the given number of seconds"""
+        self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+    async def acquire(self):
+        """Wait for a token"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._resume_at:
+                    await asyncio.sleep(self._resume_at - now)
+                    continue
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+_REPOSITORY_ID_QUERY = """
+query($owner: String!, $name: String!) {
+  repository(owner: $owner, name: $name) { id }
+}
+"""
+
+# Top-level mutation fields run in order, so the PR sees the ref created just before it
+_CREATE_REF_AND_PR_MUTATION = """
+mutation($repositoryId: ID!, $ref: String!, $oid: GitObjectID!,
+         $base: String!, $head: String!, $title: String!, $body: String!) {
+  createRef(input: {repositoryId: $repositoryId, name: $ref, oid: $oid}) { ref { id } }
+  createPullRequest(input: {repositoryId: $repositoryId, baseRefName: $base,
+                            headRefName: $head, title: $title, body: $body}) {
+    pullRequest { url }
+  }
+}
+"""
+
+
 class GitPlatformClient:
     """Client for Git platform operations (GitHub/GitLab)"""
 
-    def __init__(self, platform: str, token: str, base_url: str = None):
+    max_attempts = 3
+    retry_backoff = 1.0
+    max_retry_wait = 60.0
+
+    def __init__(self, platform: str, token: str, base_url: str = None,
+                 session: Optional[httpx.AsyncClient] = None,
+                 host_limits: Optional[Dict[str, asyncio.Semaphore]] = None,
+                 concurrency: int = 4, rps: float = 1.0):
         self.platform = platform.lower()
         self.token = token
         self.base_url = base_url or self._get_default_base_url()
-        self.session = httpx.AsyncClient(
-            headers={
-                'Authorization': f'token {token}' if platform == 'github' else f'Bearer {token}',
-                'Accept': 'application/vnd.github.v3+json' if platform == 'github' else 'application/json',
-            },
+        # Credentials go per request so one pooled session can serve every client
+        self._headers = {
+            'Authorization': f'token {token}' if platform == 'github' else f'Bearer {token}',
+            'Accept': 'application/vnd.github.v3+json' if platform == 'github' else 'application/json',
+        }
+        self._owns_session = session is None
+        self.session = session or httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=64, max_connections=64),
             timeout=30.0
         )
+        # Clients for the same API host share one concurrency cap
+        host = urlparse(self.base_url).netloc
+        limits = host_limits if host_limits is not None else {}
+        self._sem = limits.setdefault(host, asyncio.Semaphore(concurrency))
+        self._rate = AsyncTokenBucket(rate=rps)
+        self._repository_ids: Dict[str, str] = {}
 
     def _get_default_base_url(self) -> str:
         if self.platform == 'github':
@@ -130,6 +208,47 @@ class GitPlatformClient:
         else:
             raise ValueError(f'Unsupported platform: {self.platform}')
 
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a throttled API request, backing off on rate-limit responses"""
+        for attempt in range(self.max_attempts):
+            async with self._sem:
+                await self._rate.acquire()
+                response = await self.session.request(method, url, headers=self._headers, **kwargs)
+
+            delay = self._rate_limit_delay(response, attempt)
+            if delay is None:
+                return response
+            if response.status_code not in (403, 429):
+                # Budget exhausted but this call went through; hold later ones
+                self._rate.defer(delay)
+                return response
+
+            logger.warning("Rate limited by git platform", url=url,
+                           status=response.status_code, retry_in=delay, attempt=attempt + 1)
+            self._rate.defer(delay)
+
+        return response
+
+    def _rate_limit_delay(self, response: httpx.Response, attempt: int) -> Optional[float]:
+        """Seconds to wait before the next call, or None when not rate limited"""
+        headers = response.headers
+        delay = None
+        if 'Retry-After' in headers:
+            try:
+                delay = float(headers['Retry-After'])
+            except ValueError:
+                delay = None
+        if delay is None and headers.get('X-RateLimit-Remaining') == '0':
+            try:
+                delay = float(headers.get('X-RateLimit-Reset', 0)) - time.time()
+            except ValueError:
+                delay = None
+        if delay is None and response.status_code != 429:
+            # A plain 403 is a permission error, not throttling
+            return None
+        delay = max(delay or 0.0, self.retry_backoff * (2 ** attempt))
+        return min(delay, self.max_retry_wait)
+
     async def create_branch(self, repo: str, branch_name: str, base_sha: str) -> bool:
         """Create a new branch"""
         try:
@@ -139,7 +258,7 @@ class GitPlatformClient:
                     'ref': f'refs/heads/{branch_name}',
                     'sha': base_sha
                 }
-                response = await self.session.post(url, json=data)
+                response = await self._request('POST', url, json=data)
                 return response.status_code == 201
             elif self.platform == 'gitlab':
                 url = f'{self.base_url}/projects/{repo.replace("/", "%2F")}/repository/branches'
@@ -147,7 +266,7 @@ class GitPlatformClient:
                     'branch': branch_name,
                     'ref': base_sha
                 }
-                response = await self.session.post(url, json=data)
+                response = await self._request('POST', url, json=data)
                 return response.status_code == 201
         except Exception as e:
             logger.error("Failed to create branch", error=str(e))
@@ -165,7 +284,7 @@ class GitPlatformClient:
                     'base': pr_details.base_branch,
                     'labels': pr_details.labels,
                 }
-                response = await self.session.post(url, json=data)
+                response = await self._request('POST', url, json=data)
                 if response.status_code == 201:
                     pr_data = response.json()
                     return pr_data.get('html_url')
@@ -178,7 +297,7 @@ class GitPlatformClient:
                     'target_branch': pr_details.base_branch,
                     'labels': ','.join(pr_details.labels) if pr_details.labels else '',
                 }
-                response = await self.session.post(url, json=data)
+                response = await self._request('POST', url, json=data)
                 if response.status_code == 201:
                     pr_data = response.json()
                     return pr_data.get('web_url')
@@ -186,17 +305,134 @@ class GitPlatformClient:
             logger.error("Failed to create pull request", error=str(e))
             return None
 
+    def _graphql_url(self) -> str:
+        # GitHub Enterprise serves REST under /api/v3 and GraphQL at /api/graphql
+        if self.base_url.endswith('/v3'):
+            return self.base_url[:-len('v3')] + 'graphql'
+        return f'{self.base_url}/graphql'
+
+    async def _graphql(self, query: str, variables: Dict[str, Any],
+                       partial: bool = False) -> Optional[Dict[str, Any]]:
+        """Run a GitHub GraphQL document; one call against the rate limit
+
+        With partial=True, data is returned even alongside errors, so callers can
+        see which fields of a multi-step mutation went through.
+        """
+        response = await self._request('POST', self._graphql_url(), json={'query': query, 'variables': variables})
+        if response.status_code != 200:
+            logger.error("GraphQL request failed", status=response.status_code)
+            return None
+        payload = response.json()
+        if payload.get('errors'):
+            logger.error("GraphQL request returned errors", errors=payload['errors'])
+            if not partial:
+                return None
+        return payload.get('data')
+
+    async def get_repository_id(self, repo: str) -> Optional[str]:
+        """GraphQL node id of a GitHub repository, looked up once per repo"""
+        repository_id = self._repository_ids.get(repo)
+        if repository_id is None:
+            owner, _, name = repo.partition('/')
+            data = await self._graphql(_REPOSITORY_ID_QUERY, {'owner': owner, 'name': name})
+            repository_id = ((data or {}).get('repository') or {}).get('id')
+            if repository_id:
+                self._repository_ids[repo] = repository_id
+        return repository_id
+
+    async def create_pr_graphql(self, repo: str, pr_details: PRDetails, base_sha: str) -> Optional[str]:
+        """Create the head branch at base_sha and open a pull request in one GitHub call"""
+        try:
+            repository_id = await self.get_repository_id(repo)
+            if not repository_id:
+                return None
+
+            data = await self._graphql(_CREATE_REF_AND_PR_MUTATION, {
+                'repositoryId': repository_id,
+                'ref': f'refs/heads/{pr_details.branch_name}',
+                'oid': base_sha,
+                'base': pr_details.base_branch,
+                'head': pr_details.branch_name,
+                'title': pr_details.title,
+                'body': pr_details.body,
+            }, partial=True) or {}
+            pull_request = (data.get('createPullRequest') or {}).get('pullRequest') or {}
+            if pull_request.get('url'):
+                return pull_request['url']
+
+            if (data.get('createRef') or {}).get('ref'):
+                # The branch went through but the PR didn't: retry over REST, and
+                # never leave the branch behind to block the next attempt
+                pr_url = await self.create_pull_request(repo, pr_details)
+                if pr_url:
+                    return pr_url
+                await self.delete_branch(repo, pr_details.branch_name)
+            return None
+        except Exception as e:
+            logger.error("Failed to create pull request via GraphQL", error=str(e))
+            return None
+
+    async def delete_branch(self, repo: str, branch: str) -> bool:
+        """Delete a GitHub branch"""
+        try:
+            response = await self._request('DELETE', f'{self.base_url}/repos/{repo}/git/refs/heads/{branch}')
+            if response.status_code == 204:
+                return True
+            logger.error("Failed to delete branch", branch=branch, status=response.status_code)
+        except Exception as e:
+            logger.error("Failed to delete branch", branch=branch, error=str(e))
+        return False
+
+    async def get_branch_head(self, repo: str, branch: str) -> Optional[Tuple[str, str]]:
+        """Commit and tree SHAs at the tip of a GitHub branch"""
+        try:
+            response = await self._request('GET', f'{self.base_url}/repos/{repo}/commits/{branch}')
+            if response.status_code == 200:
+                commit = response.json()
+                return commit['sha'], commit['commit']['tree']['sha']
+        except Exception as e:
+            logger.error("Failed to resolve branch head", branch=branch, error=str(e))
+        return None
+
+    async def commit_files_via_api(self, repo: str, base_sha: str, base_tree: str,
+                                   files: Dict[str, str], message: str) -> Optional[str]:
+        """Commit files on top of base_sha through the git data API, without a clone"""
+        try:
+            # Inline tree contents let GitHub write the blobs, so no per-file blob calls
+            tree = [
+                {'path': path, 'mode': '100644', 'type': 'blob', 'content': content}
+                for path, content in files.items()
+            ]
+            response = await self._request('POST', f'{self.base_url}/repos/{repo}/git/trees',
+                                           json={'base_tree': base_tree, 'tree': tree})
+            if response.status_code != 201:
+                logger.error("Failed to create tree", status=response.status_code)
+                return None
+
+            response = await self._request('POST', f'{self.base_url}/repos/{repo}/git/commits', json={
+                'message': message,
+                'tree': response.json()['sha'],
+                'parents': [base_sha],
+            })
+            if response.status_code != 201:
+                logger.error("Failed to create commit", status=response.status_code)
+                return None
+            return response.json()['sha']
+        except Exception as e:
+            logger.error("Failed to commit files via API", error=str(e))
+            return None
+
     async def get_default_branch(self, repo: str) -> Optional[str]:
         """Get the default branch for a repository"""
         try:
             if self.platform == 'github':
                 url = f'{self.base_url}/repos/{repo}'
-                response = await self.session.get(url)
+                response = await self._request('GET', url)
                 if response.status_code == 200:
                     return response.json().get('default_branch')
             elif self.platform == 'gitlab':
                 url = f'{self.base_url}/projects/{repo.replace("/", "%2F")}'
-                response = await self.session.get(url)
+                response = await self._request('GET', url)
                 if response.status_code == 200:
                     return response.json().get('default_branch')
         except Exception as e:
@@ -204,8 +440,17 @@ class GitPlatformClient:
             return None
 
     async def close(self):
-        """Close the HTTP session"""
-        await self.session.aclose()
+        """Close the HTTP session if this client created it"""
+        if self._owns_session:
+            await self.session.aclose()
+
+
+_SEV_EMOJI = {
+    'critical': '🚨',
+    'high': '⚠️',
+    'medium': 'ℹ️',
+    'low': '📝'
+}
 
 
 class ChangelogGenerator:
@@ -222,84 +467,82 @@ class ChangelogGenerator:
 
     def generate_changelog(self, drafts: List[Dict], gaps: List[Dict], project_name: str) -> str:
         """Generate a comprehensive changelog"""
-        sections = []
+        buf = io.StringIO()
+        w = buf.write
 
         # Header
-        sections.append(f"# 📝 Documentation Updates - {project_name}")
-        sections.append(f"\n**Generated on:** {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')}")
-        sections.append("")
+        w(f"# 📝 Documentation Updates - {project_name}\n\n")
+        w(f"**Generated on:** {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')}\n\n")
 
         # Summary statistics
-        total_drafts = len(drafts)
-        total_gaps = len(gaps)
-        critical_gaps = len([g for g in gaps if g.get('severity') == 'critical'])
-        high_gaps = len([g for g in gaps if g.get('severity') == 'high'])
-
-        sections.append("## 📊 Summary")
-        sections.append(f"- **New Drafts:** {total_drafts}")
-        sections.append(f"- **Gaps Addressed:** {total_gaps}")
+        severity_counts = Counter(g.get('severity', 'medium') for g in gaps)
+        critical_gaps = severity_counts['critical']
+        high_gaps = severity_counts['high']
+
+        w("## 📊 Summary\n")
+        w(f"- **New Drafts:** {len(drafts)}\n")
+        w(f"- **Gaps Addressed:** {len(gaps)}\n")
         if critical_gaps > 0:
-            sections.append(f"- **Critical Issues:** {critical_gaps} ⚠️")
+            w(f"- **Critical Issues:** {critical_gaps} ⚠️\n")
         if high_gaps > 0:
-            sections.append(f"- **High Priority:** {high_gaps} ⚠️")
-        sections.append("")
+            w(f"- **High Priority:** {high_gaps} ⚠️\n")
+        w("\n")
 
         # Drafts section
         if drafts:
-            sections.append("## 📝 New Documentation")
+            w("## 📝 New Documentation\n")
             for draft in drafts:
                 draft_type = draft.get('frontmatter', {}).get('draft_type', 'general')
                 title = draft.get('frontmatter', {}).get('title', 'Untitled Draft')
-                sections.append(f"- **{title}** ({draft_type})")
+                w(f"- **{title}** ({draft_type})\n")
                 if draft.get('rationale'):
                     rationale = draft['rationale'].get('summary', '')
                     if rationale:
-                        sections.append(f"  - {rationale}")
-            sections.append("")
+                        w(f"  - {rationale}\n")
+            w("\n")
 
         # Gap resolutions
         if gaps:
-            sections.append("## 🐛 Issues Resolved")
+            w("## 🐛 Issues Resolved\n")
             for gap in gaps:
                 gap_type = gap.get('type', 'unknown')
-                severity = gap.get('severity', 'medium')
+                emoji = _SEV_EMOJI.get(gap.get('severity', 'medium'), '📝')
                 reason = gap.get('reason', 'Documentation gap')
-
-                emoji = {
-                    'critical': '🚨',
-                    'high': '⚠️',
-                    'medium': 'ℹ️',
-                    'low': '📝'
-                }.get(severity, '📝')
-
-                sections.append(f"- {emoji} **{gap_type.title()}**: {reason}")
-            sections.append("")
+                w(f"- {emoji} **{gap_type.title()}**: {reason}\n")
+            w("\n")
 
         # Technical details
-        sections.append("## 🔧 Technical Details")
-        sections.append("### Files Modified")
+        w("## 🔧 Technical Details\n")
+        w("### Files Modified\n")
 
         # Group drafts by type
-        draft_types = {}
+        draft_types = defaultdict(list)
         for draft in drafts:
             draft_type = draft.get('frontmatter', {}).get('draft_type', 'general')
-            if draft_type not in draft_types:
-                draft_types[draft_type] = []
             draft_types[draft_type].append(draft)
 
         for draft_type, type_drafts in draft_types.items():
-            sections.append(f"**{draft_type.title()} Documentation:**")
+            w(f"**{draft_type.title()} Documentation:**\n")
             for draft in type_drafts:
-                doc_path = draft.get('doc_path', 'new-file.md')
-                sections.append(f"  - `{doc_path}`")
-        sections.append("")
+                w(f"  - `{draft.get('doc_path', 'new-file.md')}`\n")
+        w("\n")
 
         # Footer
-        sections.append("---")
-        sections.append("*This changelog was automatically generated by AI Documentation Gap Finder*")
-        sections.append("*Review and test all changes before merging*")
+        w("---\n")
+        w("*This changelog was automatically generated by AI Documentation Gap Finder*\n")
+        w("*Review and test all changes before merging*")
 
-        return "\n".join(sections)
+        return buf.getvalue()
+
+
+_GAP_TABLE_HEADER = ['Type', 'Severity', 'Description', 'Status']
+_GAP_TABLE_LIMIT = 50
+_SEV_ORDER = {'critical': 0, 'high': 1, 'medium': 2, 'low': 3}
+
+
+def _severity_rank(gap: Dict) -> int:
+    """Sort key putting the most severe gaps first; unknown severities last"""
+    return _SEV_ORDER.get(gap.get('severity'), len(_SEV_ORDER))
 
 
 class PDFGenerator:
@@ -319,12 +562,38 @@ class PDFGenerator:
             fontSize=16,
             spaceAfter=12,
         )
+        self.gap_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ])
+
+    @staticmethod
+    def _gap_rows(gaps: List[Dict]) -> List[List[str]]:
+        """Gap table rows, with each reason looked up and truncated once"""
+        rows = []
+        for gap in gaps:
+            reason = gap.get('reason', '')
+            if len(reason) > 100:
+                reason = reason[:100] + '...'
+            rows.append([
+                gap.get('type', 'Unknown'),
+                gap.get('severity', 'Medium'),
+                reason,
+                gap.get('status', 'Open')
+            ])
+        return rows
 
-    def generate_pdf_report(self, data: Dict[str, Any], output_path: Path) -> bool:
-        """Generate comprehensive PDF report"""
+    def generate_pdf_report(self, data: Dict[str, Any], output: Union[Path, BinaryIO]) -> bool:
+        """Generate comprehensive PDF report into a file path or binary stream"""
         try:
             doc = SimpleDocTemplate(
-                str(output_path),
+                output if hasattr(output, 'write') else str(output),
                 pagesize=letter,
                 rightMargin=72,
                 leftMargin=72,
@@ -358,27 +627,10 @@ class PDFGenerator:
             # Gap Analysis Table
             if data.get('gaps'):
                 story.append(Paragraph("Gap Analysis", self.heading_style))
-                gap_table_data = [['Type', 'Severity', 'Description', 'Status']]
-
-                for gap in data['gaps'][:50]:  # Limit to first 50 for readability
-                    gap_table_data.append([
-                        gap.get('type', 'Unknown'),
-                        gap.get('severity', 'Medium'),
-                        gap.get('reason', '')[:100] + '...' if len(gap.get('reason', '')) > 100 else gap.get('reason', ''),
-                        gap.get('status', 'Open')
-                    ])
-
-                table = Table(gap_table_data)
-                table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 12),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                ]))
+                # Limit to the 50 most severe for readability; ties keep their original order
+                top_gaps = heapq.nsmallest(_GAP_TABLE_LIMIT, data['gaps'], key=_severity_rank)
+                table = Table([_GAP_TABLE_HEADER] + self._gap_rows(top_gaps), repeatRows=1)
+                table.setStyle(self.gap_table_style)
                 story.append(table)
                 story.append(Spacer(1, 12))
 
@@ -400,50 +652,109 @@ class PDFGenerator:
             return False
 
 
+_pdf_generator: Optional[PDFGenerator] = None
+
+
+def render_pdf(data: Dict[str, Any]) -> Optional[bytes]:
+    """Render a PDF report to bytes; top-level so it can run in a worker process"""
+    global _pdf_generator
+    if _pdf_generator is None:
+        _pdf_generator = PDFGenerator()
+    buf = io.BytesIO()
+    if not _pdf_generator.generate_pdf_report(data, buf):
+        return None
+    return buf.getvalue()
+
+
+# Beyond this many paths, hand git a pathspec file instead of argv
+_PATHSPEC_FILE_THRESHOLD = 1000
+
+
 class BranchManager:
     """Manages Git branch operations for documentation updates"""
 
     def __init__(self, workspace_dir: Path):
         self.workspace_dir = workspace_dir
+        # Partial clones keyed by repo URL; each export gets its own worktree
+        self._clone_cache: Dict[str, Path] = {}
+        self._clone_locks: Dict[str, asyncio.Lock] = {}
 
     def generate_branch_name(self, project_id: str, timestamp: Optional[float] = None) -> str:
         """Generate a conventional branch name"""
         ts = timestamp or time.time()
-        date_str = datetime.fromtimestamp(ts).strftime('%Y%m%d_%H%M%S')
-        return f"docs/auto-update-{project_id}-{date_str}"
+        date_str = time.strftime('%Y%m%d_%H%M%S', time.gmtime(ts))
+        # The suffix keeps branches apart when one project exports twice in a second
+        return f"docs/auto-update-{project_id}-{date_str}-{secrets.token_hex(2)}"
 
     async def setup_branch(self, repo_url: str, branch_name: str, base_branch: str = 'main') -> Tuple[Path, bool]:
-        """Set up a Git repository with the new branch"""
+        """Set up a worktree for the new branch on a cached partial clone"""
+        repo_name = repo_url.rstrip('/').split('/')[-1].replace('.git', '')
+        worktree_path = self.workspace_dir / 'worktrees' / f"{repo_name}-{branch_name.replace('/', '-')}"
         try:
-            # Create workspace for this repo
-            repo_name = repo_url.split('/')[-1].replace('.git', '')
-            repo_path = self.workspace_dir / repo_name
-            repo_path.mkdir(exist_ok=True)
-
-            # Clone repository
-            clone_cmd = ['git', 'clone', '--depth', '1', '--branch', base_branch, repo_url, str(repo_path)]
-            result = await self._run_command(clone_cmd)
-
-            if not result:
-                return repo_path, False
+            lock = self._clone_locks.setdefault(repo_url, asyncio.Lock())
+            async with lock:
+                store = await self._ensure_clone(repo_url, repo_name, base_branch)
+                if store is None:
+                    return worktree_path, False
 
-            # Create and checkout new branch
-            checkout_cmd = ['git', 'checkout', '-b', branch_name]
-            result = await self._run_command(checkout_cmd, cwd=repo_path)
+                # Branch straight off the fetched base into a private worktree
+                worktree_cmd = ['git', 'worktree', 'add', '--no-track', '-B', branch_name,
+                                str(worktree_path), f'origin/{base_branch}']
+                result = await self._run_command(worktree_cmd, cwd=store)
 
-            return repo_path, result
+            return worktree_path, result
 
         except Exception as e:
             logger.error("Failed to setup branch", error=str(e))
-            return repo_path, False
+            return worktree_path, False
+
+    async def _ensure_clone(self, repo_url: str, repo_name: str, base_branch: str) -> Optional[Path]:
+        """Clone the repository once, then only fetch the base branch tip"""
+        store = self._clone_cache.get(repo_url)
+        if store is not None:
+            fetch_cmd = ['git', 'fetch', '--depth', '1', 'origin',
+                         f'+refs/heads/{base_branch}:refs/remotes/origin/{base_branch}']
+            if await self._run_command(fetch_cmd, cwd=store):
+                return store
+            # Fall through and re-clone a store that can no longer fetch
+            self._clone_cache.pop(repo_url, None)
+
+        # Keyed by the full URL so same-named repos from different owners never share a store
+        url_hash = hashlib.sha1(repo_url.encode()).hexdigest()[:12]
+        store = self.workspace_dir / 'repos' / f"{repo_name}-{url_hash}"
+        if store.exists():
+            await asyncio.to_thread(shutil.rmtree, store)
+        store.parent.mkdir(parents=True, exist_ok=True)
+
+        # Blobless shallow clone: only the base commit and its trees come over
+        clone_cmd = ['git', 'clone', '--depth', '1', '--filter=blob:none', '--single-branch',
+                     '--no-checkout', '--branch', base_branch, '-o', 'origin', repo_url, str(store)]
+        if not await self._run_command(clone_cmd):
+            return None
+
+        self._clone_cache[repo_url] = store
+        return store
+
+    async def remove_worktree(self, repo_path: Path) -> bool:
+        """Drop an export's worktree once its branch has been pushed"""
+        return await self._run_command(['git', 'worktree', 'remove', '--force', str(repo_path)], cwd=repo_path)
 
     async def commit_changes(self, repo_path: Path, commit_message: str, files: List[Path]) -> bool:
         """Commit changes to the repository"""
         try:
-            # Add files
-            for file_path in files:
-                add_cmd = ['git', 'add', str(file_path)]
-                await self._run_command(add_cmd, cwd=repo_path)
+            # Stage every file with one git invocation and one index write
+            if len(files) > _PATHSPEC_FILE_THRESHOLD:
+                with tempfile.NamedTemporaryFile('w', suffix='.pathspec', encoding='utf-8') as pathspec:
+                    pathspec.write('\n'.join(str(p) for p in files))
+                    pathspec.flush()
+                    add_cmd = ['git', 'add', f'--pathspec-from-file={pathspec.name}']
+                    added = await self._run_command(add_cmd, cwd=repo_path)
+            else:
+                add_cmd = ['git', 'add', '--'] + [str(p) for p in files]
+                added = await self._run_command(add_cmd, cwd=repo_path)
+
+            if not added:
+                return False
 
             # Commit
             commit_cmd = ['git', 'commit', '-m', commit_message]
@@ -470,17 +781,19 @@ class BranchManager:
     async def _run_command(self, cmd: List[str], cwd: Optional[Path] = None) -> bool:
         """Run a shell command"""
         try:
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=str(cwd) if cwd else None
+            # A worker thread avoids building an event-loop pipe transport per git call
+            result = await asyncio.to_thread(
+                subprocess.run,
+                cmd,
+                cwd=str(cwd) if cwd else None,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                check=False
             )
 
-            stdout, stderr = await process.communicate()
-
-            if process.returncode != 0:
-                error_msg = stderr.decode().strip()
+            if result.returncode != 0:
+                error_msg = result.stderr.decode(errors='replace').strip()
                 logger.warning("Command failed", command=cmd, error=error_msg)
                 return False
 
@@ -491,6 +804,144 @@ class BranchManager:
             return False
 
 
+_PLATFORM_RE = re.compile(r'(github|gitlab)\.com')
+# Last two path segments, for https://host/owner/repo(.git) and git@host:owner/repo(.git)
+_REPO_NAME_RE = re.compile(r'[:/]([^/:]+)/([^/]+?)(?:\.git)?/*$')
+
+
+@functools.lru_cache(maxsize=1024)
+def _detect_platform(repo_url: str) -> str:
+    """Detect Git platform from repository URL"""
+    match = _PLATFORM_RE.search(repo_url)
+    return match.group(1) if match else 'github'  # Default
+
+
+@functools.lru_cache(maxsize=1024)
+def _extract_repo_name(repo_url: str) -> str:
+    """Extract owner/repo from a repository URL"""
+    match = _REPO_NAME_RE.search(repo_url)
+    if match:
+        return f"{match.group(1)}/{match.group(2)}"
+    return repo_url
+
+
+_BUNDLE_ZSTD_LEVEL = 3
+
+
+def _encode_bundle(data: Dict[str, Any]) -> bytes:
+    """Serialize a bundle into a zstd stream one top-level section at a time"""
+    # Only one section's JSON is ever held uncompressed, never the whole report.
+    # Compressors are not thread safe, so each bundle gets its own.
+    out = io.BytesIO()
+    compressor = zstd.ZstdCompressor(level=_BUNDLE_ZSTD_LEVEL, threads=-1)
+    with compressor.stream_writer(out, closefd=False) as writer:
+        writer.write(b'{')
+        for index, (key, value) in enumerate(data.items()):
+            if index:
+                writer.write(b',')
+            writer.write(orjson.dumps(str(key)))
+            writer.write(b':')
+            writer.write(orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS))
+        writer.write(b'}')
+    return out.getvalue()
+
+
+def _safe_doc_path(doc_path: str) -> Optional[str]:
+    """Repo-relative form of a draft's doc path, or None if it would leave the repo"""
+    path = posixpath.normpath(doc_path.replace('\\', '/')).lstrip('/')
+    top = path.split('/', 1)[0]
+    if not path or top in ('.', '..', '.git'):
+        return None
+    return path
+
+
+def _draft_files(drafts: List[Dict]) -> Dict[str, str]:
+    """Repo-relative path -> content for each draft; later drafts for a path win"""
+    files: Dict[str, str] = {}
+    for draft in drafts:
+        doc_path = draft.get('doc_path', 'new-documentation.md')
+        path = _safe_doc_path(doc_path)
+        if path is None:
+            logger.error("Skipping draft with unsafe doc path", doc_path=doc_path)
+            continue
+        files[path] = draft.get('mdx_content', '')
+    return files
+
+
+def _bundle_filename(project_id: str, extension: str) -> str:
+    """Unique bundle name: concurrent exports from every worker share one bucket"""
+    safe_id = re.sub(r'[^A-Za-z0-9_.-]', '-', project_id) or 'project'
+    return f"docgap-report-{safe_id}-{int(time.time())}-{secrets.token_hex(4)}.{extension}"
+
+
+def _sync_write(path: Path, content: str):
+    """Write a text file in one blocking call, for use with asyncio.to_thread"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+def _write_drafts_batch(files: Dict[Path, str]) -> Dict[Path, OSError]:
+    """Write a batch of text files in one blocking call; returns per-file errors"""
+    by_parent: Dict[Path, List[Path]] = defaultdict(list)
+    for path in files:
+        by_parent[path.parent].append(path)
+
+    errors = {}
+    for parent, paths in by_parent.items():
+        # One mkdir per directory rather than one per file
+        try:
+            parent.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            errors.update((path, e) for path in paths)
+            continue
+
+        for path in paths:
+            try:
+                # Raw fd writes skip the buffered text-file layer for these small files
+                data = memoryview(files[path].encode('utf-8'))
+                fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+                try:
+                    while data:
+                        data = data[os.write(fd, data):]
+                finally:
+                    os.close(fd)
+            except OSError as e:
+                errors[path] = e
+    return errors
+
+
+# S3 multipart part size; parts other than the last must be at least 5 MiB
+_S3_PART_SIZE = 8 * 1024 * 1024
+
+_INFLIGHT_KEY_PREFIX = "exp:inflight:"
+_INFLIGHT_SET = "exp:inflight"
+
+# Exports below both limits are committed through the GitHub API instead of a clone
+_API_COMMIT_MAX_FILES = 50
+_API_COMMIT_MAX_BYTES = 1 << 20
+
+# Indexed by (has_drafts << 1) | has_gaps
+_COMMIT_MESSAGES = (
+    "docs: update documentation",
+    "docs: address {gaps} documentation gaps",
+    "docs: add {drafts} documentation drafts",
+    "docs: add {drafts} documentation drafts addressing {gaps} gaps",
+)
+
+_PR_BODY_TEMPLATE = string.Template(
+    "## 📋 Summary\n"
+    "- **Drafts Added:** $drafts_count\n"
+    "- **Gaps Addressed:** $gaps_count\n"
+    "- **Branch:** `$branch`\n"
+    "\n"
+    "## 📝 Changes$draft_list$changelog_section\n"
+    "\n"
+    "---\n"
+    "*This PR was automatically generated by AI Documentation Gap Finder*\n"
+    "*Please review all changes before merging*"
+)
+
+
 class ExportWorker:
     """Main export worker"""
 
@@ -499,13 +950,65 @@ class ExportWorker:
         self.redis_client = None
         self.nats_client = None
 
+        # In-flight export tasks, bounded by the work semaphore
+        self._work_sem = asyncio.Semaphore(config.get("max_concurrent_exports", 8))
+        self._pending: Set[asyncio.Task] = set()
+
+        # Project-level lookups are shared by every export of a project
+        self.lookup_ttl = config.get("lookup_cache_ttl", 300)
+
+        # Requests are acked on receipt; Redis tracks them until they finish
+        self.inflight_ttl = config.get("inflight_ttl", 3600)
+        self._reaper: Optional[asyncio.Task] = None
+        self._stop = asyncio.Event()
+
         # Initialize components
         self.workspace_dir = Path(config.get("workspace_dir", "/tmp/ai-docgap/exports"))
         self.workspace_dir.mkdir(exist_ok=True)
 
         self.branch_manager = BranchManager(self.workspace_dir)
         self.changelog_generator = ChangelogGenerator()
-        self.pdf_generator = PDFGenerator()
+
+        # ReportLab layout is CPU bound; it runs in worker processes, a few at a time
+        self.pdf_pool = None
+
+        # Object storage for bundles; bundles stay on local disk when unset
+        self.s3_client = None
+        self._exit_stack = AsyncExitStack()
+        self._pdf_sem = asyncio.Semaphore(config.get("pdf_concurrency", 2))
+
+        # One HTTP/2 connection pool for all platform API calls; API clients are
+        # keyed by (platform, token) and share per-host concurrency caps
+        self.http = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=128, max_keepalive_connections=64),
+            timeout=30.0
+        )
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._git_clients: Dict[Tuple[str, str], GitPlatformClient] = {}
+
+    async def _init_object_storage(self):
+        """Open the S3/MinIO client used to publish bundles"""
+        endpoint = self.config.get("s3_endpoint") or None
+        if endpoint and '://' not in endpoint:
+            endpoint = f"http://{endpoint}"
+
+        session = aioboto3.Session()
+        self.s3_client = await self._exit_stack.enter_async_context(session.client(
+            's3',
+            endpoint_url=endpoint,
+            aws_access_key_id=self.config.get("s3_access_key") or None,
+            aws_secret_access_key=self.config.get("s3_secret_key") or None,
+            region_name=self.config.get("s3_region", "us-east-1"),
+            config=BotoConfig(max_pool_connections=self.config.get("s3_max_pool_connections", 32))
+        ))
+
+        bucket = self.config["bundle_bucket"]
+        try:
+            await self.s3_client.head_bucket(Bucket=bucket)
+        except ClientError:
+            await self.s3_client.create_bucket(Bucket=bucket)
+            logger.info("Created bundle bucket", bucket=bucket)
 
     async def initialize(self):
         """Initialize connections"""
@@ -520,6 +1023,13 @@ class ExportWorker:
             self.config.get("nats_url", "nats://localhost:4222")
         )
 
+        pdf_workers = self.config.get("pdf_workers", 0)
+        if pdf_workers > 0:
+            self.pdf_pool = ProcessPoolExecutor(max_workers=pdf_workers)
+
+        if self.config.get("bundle_bucket"):
+            await self._init_object_storage()
+
         logger.info("Export worker initialized")
 
     async def run(self):
@@ -532,7 +1042,10 @@ class ExportWorker:
         logger.info("Subscribing to export requests", subject=subject, queue=queue_group)
 
         async def message_handler(msg):
-            await self.handle_export_request(msg)
+            # Hand off so NATS can deliver the next request while this one runs
+            task = asyncio.create_task(self._run_with_sem(msg))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
 
         await self.nats_client.subscribe(
             subject,
@@ -540,15 +1053,46 @@ class ExportWorker:
             cb=message_handler
         )
 
-        while True:
-            await asyncio.sleep(1)
+        # Every worker drops its cached lookups when a project's data changes
+        await self.nats_client.subscribe("docs.cache.invalidate", cb=self.handle_cache_invalidation)
+        await self.nats_client.subscribe("drafts.updated", cb=self.handle_cache_invalidation)
+
+        self._reaper = asyncio.create_task(self._reap_inflight())
+
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, self.stop)
+
+        # Sleep until a shutdown signal arrives
+        await self._stop.wait()
+        logger.info("Received shutdown signal")
+
+    def stop(self):
+        """Ask the worker loop to exit"""
+        self._stop.set()
+
+    async def _run_with_sem(self, msg):
+        """Process one export request once a work slot is free"""
+        async with self._work_sem:
+            await self.handle_export_request(msg)
 
     async def handle_export_request(self, msg):
         """Handle incoming export request"""
+        inflight_id = None
         try:
-            data = json.loads(msg.data.decode())
+            data = orjson.loads(msg.data)
             request = ExportRequest(**data)
 
+            # Claim, then ack up front: the in-flight sentinel rather than broker
+            # redelivery now guards the long clone/commit/push cycle
+            inflight_id = request.request_id or hashlib.sha1(msg.data).hexdigest()
+            claimed = await self._claim_inflight(inflight_id, msg.data)
+            await self._ack(msg)
+            if not claimed:
+                logger.info("Export request already in flight", request_id=inflight_id)
+                inflight_id = None
+                return
+
             logger.info("Processing export request",
                        project_id=request.project_id,
                        export_type=request.export_type,
@@ -574,11 +1118,8 @@ class ExportWorker:
             result.export_duration = time.time() - start_time
 
             # Publish result
-            result_data = asdict(result)
             result_subject = "docs.export.result"
-            await self.nats_client.publish(result_subject, json.dumps(result_data).encode())
-
-            await msg.ack()
+            await self.nats_client.publish(result_subject, orjson.dumps(result))
 
             logger.info("Export request processed",
                        project_id=request.project_id,
@@ -587,14 +1128,75 @@ class ExportWorker:
 
         except Exception as e:
             logger.error("Failed to process export request", error=str(e))
+        finally:
+            if inflight_id:
+                await self._release_inflight(inflight_id)
+
+    async def _ack(self, msg):
+        """Ack a request delivered with a reply subject; plain core-NATS deliveries have nothing to ack"""
+        if not msg.reply:
+            return
+        try:
+            await msg.ack()
+        except Exception as e:
+            logger.warning("Failed to ack export request", error=str(e))
+
+    async def _claim_inflight(self, inflight_id: str, payload: bytes) -> bool:
+        """Mark a request as in flight; False when another delivery already holds it"""
+        try:
+            # The payload outlives the reap deadline so a stalled export can be replayed
+            claimed = await self.redis_client.set(
+                f"{_INFLIGHT_KEY_PREFIX}{inflight_id}", payload, ex=self.inflight_ttl * 2, nx=True
+            )
+            if claimed:
+                await self.redis_client.zadd(_INFLIGHT_SET, {inflight_id: time.time()})
+            return bool(claimed)
+        except redis.RedisError as e:
+            # Without the sentinel duplicates are possible, but the export still runs
+            logger.warning("Failed to record in-flight export", request_id=inflight_id, error=str(e))
+            return True
+
+    async def _release_inflight(self, inflight_id: str):
+        """Clear a finished request's in-flight sentinel"""
+        try:
+            await self.redis_client.delete(f"{_INFLIGHT_KEY_PREFIX}{inflight_id}")
+            await self.redis_client.zrem(_INFLIGHT_SET, inflight_id)
+        except redis.RedisError as e:
+            logger.warning("Failed to clear in-flight export", request_id=inflight_id, error=str(e))
+
+    async def _reap_inflight(self):
+        """Republish requests whose export has been in flight longer than the TTL"""
+        interval = max(1, self.inflight_ttl // 4)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self._reap_stale_inflight()
+            except redis.RedisError as e:
+                logger.warning("In-flight reaper pass failed", error=str(e))
+
+    async def _reap_stale_inflight(self) -> int:
+        """One reaper pass; returns how many requests were republished"""
+        republished = 0
+        stale = await self.redis_client.zrangebyscore(_INFLIGHT_SET, '-inf', time.time() - self.inflight_ttl)
+        for inflight_id in stale:
+            # GETDEL lets exactly one reaper take each stalled request
+            payload = await self.redis_client.getdel(f"{_INFLIGHT_KEY_PREFIX}{inflight_id}")
+            await self.redis_client.zrem(_INFLIGHT_SET, inflight_id)
+            if payload:
+                logger.warning("Republishing stalled export request", request_id=inflight_id)
+                await self.nats_client.publish("docs.export", payload.encode())
+                republished += 1
+        return republished
 
     async def _handle_pr_export(self, request: ExportRequest) -> ExportResult:
         """Handle PR export to documentation repository"""
         try:
-            # Get drafts and gaps data
-            drafts = await self._get_drafts_data(request.drafts or [])
-            gaps = await self._get_gaps_data(request.gaps or [])
-            project = await self._get_project_data(request.project_id)
+            # Get drafts, gaps and project data concurrently
+            drafts, gaps, project = await asyncio.gather(
+                self._get_drafts_data(request.drafts or []),
+                self._get_gaps_data(request.gaps or []),
+                self._get_project_data(request.project_id)
+            )
 
             if not drafts:
                 return ExportResult(
@@ -608,6 +1210,17 @@ class ExportWorker:
             # Generate branch name
             branch_name = self.branch_manager.generate_branch_name(request.project_id)
 
+            # Generate changelog
+            changelog = None
+            if request.include_changelog:
+                changelog = self.changelog_generator.generate_changelog(
+                    drafts, gaps, project.get('name', 'Project')
+                )
+
+            # Small GitHub exports skip the clone and commit through the API
+            if _detect_platform(request.target_repo) == 'github' and self._fits_api_commit(drafts, changelog):
+                return await self._handle_api_pr_export(request, drafts, gaps, changelog, branch_name)
+
             # Setup branch
             repo_path, branch_created = await self.branch_manager.setup_branch(
                 request.target_repo,
@@ -623,103 +1236,151 @@ class ExportWorker:
                     request_id=request.request_id
                 )
 
-            # Create/modify documentation files
-            modified_files = await self._create_documentation_files(repo_path, drafts)
+            try:
+                # Create/modify documentation files
+                modified_files = await self._create_documentation_files(repo_path, drafts)
+
+                if not modified_files:
+                    return ExportResult(
+                        project_id=request.project_id,
+                        export_type='pr',
+                        success=False,
+                        error_message="No files were modified",
+                        request_id=request.request_id
+                    )
 
-            if not modified_files:
-                return ExportResult(
-                    project_id=request.project_id,
-                    export_type='pr',
-                    success=False,
-                    error_message="No files were modified",
-                    request_id=request.request_id
+                # Write changelog
+                if changelog:
+                    changelog_path = repo_path / 'CHANGELOG.md'
+                    await asyncio.to_thread(_sync_write, changelog_path, changelog)
+                    modified_files.append(changelog_path)
+
+                # Commit changes
+                commit_message = self._generate_commit_message(drafts, gaps)
+                commit_success = await self.branch_manager.commit_changes(
+                    repo_path, commit_message, modified_files
                 )
 
-            # Generate changelog
-            changelog = None
-            if request.include_changelog:
-                changelog = self.changelog_generator.generate_changelog(
-                    drafts, gaps, project.get('name', 'Project')
+                if not commit_success:
+                    return ExportResult(
+                        project_id=request.project_id,
+                        export_type='pr',
+                        success=False,
+                        error_message="Failed to commit changes",
+                        request_id=request.request_id
+                    )
+
+                # Push branch
+                push_success = await self.branch_manager.push_branch(repo_path, branch_name)
+
+                if not push_success:
+                    return ExportResult(
+                        project_id=request.project_id,
+                        export_type='pr',
+                        success=False,
+                        error_message="Failed to push branch",
+                        request_id=request.request_id
+                    )
+
+                # Create pull request
+                pr_details = await self._create_pr_details(
+                    request, drafts, gaps, changelog, branch_name
                 )
 
-                # Write changelog
-                changelog_path = repo_path / 'CHANGELOG.md'
-                async with aiofiles.open(changelog_path, 'w', encoding='utf-8') as f:
-                    await f.write(changelog)
-                modified_files.append(changelog_path)
-
-            # Commit changes
-            commit_message = self._generate_commit_message(drafts, gaps)
-            commit_success = await self.branch_manager.commit_changes(
-                repo_path, commit_message, modified_files
-            )
-
-            if not commit_success:
-                return ExportResult(
-                    project_id=request.project_id,
-                    export_type='pr',
-                    success=False,
-                    error_message="Failed to commit changes",
-                    request_id=request.request_id
+                git_client = self.get_git_client(
+                    _detect_platform(request.target_repo),
+                    self.config.get("git_token", "")
+                )
+                pr_url = await git_client.create_pull_request(
+                    _extract_repo_name(request.target_repo),
+                    pr_details
                 )
 
-            # Push branch
-            push_success = await self.branch_manager.push_branch(repo_path, branch_name)
-
-            if not push_success:
                 return ExportResult(
                     project_id=request.project_id,
                     export_type='pr',
-                    success=False,
-                    error_message="Failed to push branch",
+                    success=bool(pr_url),
+                    pr_url=pr_url,
+                    changelog=changelog,
                     request_id=request.request_id
                 )
 
-            # Create pull request
-            pr_details = await self._create_pr_details(
-                request, drafts, gaps, changelog, branch_name
-            )
-
-            git_client = GitPlatformClient(
-                platform=self._detect_platform(request.target_repo),
-                token=self.config.get("git_token", "")
-            )
+            finally:
+                await self.branch_manager.remove_worktree(repo_path)
 
-            pr_url = await git_client.create_pull_request(
-                self._extract_repo_name(request.target_repo),
-                pr_details
+        except Exception as e:
+            logger.error("PR export failed", error=str(e))
+            return ExportResult(
+                project_id=request.project_id,
+                export_type='pr',
+                success=False,
+                error_message=str(e),
+                request_id=request.request_id
             )
 
-            await git_client.close()
-
+    def _fits_api_commit(self, drafts: List[Dict], changelog: Optional[str]) -> bool:
+        """Whether an export is small enough to commit through the git data API"""
+        if len(drafts) >= _API_COMMIT_MAX_FILES:
+            return False
+        size = len(changelog.encode()) if changelog else 0
+        size += sum(len(draft.get('mdx_content', '').encode()) for draft in drafts)
+        return size < _API_COMMIT_MAX_BYTES
+
+    async def _handle_api_pr_export(self, request: ExportRequest, drafts: List[Dict], gaps: List[Dict],
+                                    changelog: Optional[str], branch_name: str) -> ExportResult:
+        """Open a PR on GitHub using only API calls: tree, commit, then ref + PR"""
+        git_client = self.get_git_client('github', self.config.get("git_token", ""))
+        repo = _extract_repo_name(request.target_repo)
+        pr_details = await self._create_pr_details(request, drafts, gaps, changelog, branch_name)
+
+        head = await git_client.get_branch_head(repo, pr_details.base_branch)
+        if head is None:
             return ExportResult(
                 project_id=request.project_id,
                 export_type='pr',
-                success=bool(pr_url),
-                pr_url=pr_url,
-                changelog=changelog,
+                success=False,
+                error_message="Failed to resolve base branch",
                 request_id=request.request_id
             )
 
-        except Exception as e:
-            logger.error("PR export failed", error=str(e))
+        files = _draft_files(drafts)
+        if changelog:
+            files['CHANGELOG.md'] = changelog
+
+        commit_sha = await git_client.commit_files_via_api(
+            repo, *head, files, self._generate_commit_message(drafts, gaps)
+        )
+        if not commit_sha:
             return ExportResult(
                 project_id=request.project_id,
                 export_type='pr',
                 success=False,
-                error_message=str(e),
+                error_message="Failed to commit changes",
                 request_id=request.request_id
             )
 
+        pr_url = await git_client.create_pr_graphql(repo, pr_details, commit_sha)
+
+        return ExportResult(
+            project_id=request.project_id,
+            export_type='pr',
+            success=bool(pr_url),
+            pr_url=pr_url,
+            changelog=changelog,
+            request_id=request.request_id
+        )
+
     async def _handle_bundle_export(self, request: ExportRequest) -> ExportResult:
         """Handle bundle export (JSON/PDF)"""
         try:
-            # Get data
-            drafts = await self._get_drafts_data(request.drafts or [])
-            gaps = await self._get_gaps_data(request.gaps or [])
-            mappings = await self._get_mappings_data(request.project_id)
-            scores = await self._get_scores_data(request.project_id)
-            project = await self._get_project_data(request.project_id)
+            # Get data; the lookups are independent, so overlap them
+            drafts, gaps, mappings, scores, project = await asyncio.gather(
+                self._get_drafts_data(request.drafts or []),
+                self._get_gaps_data(request.gaps or []),
+                self._get_mappings_data(request.project_id),
+                self._get_scores_data(request.project_id),
+                self._get_project_data(request.project_id)
+            )
 
             bundle_data = {
                 'project': project,
@@ -730,7 +1391,7 @@ class ExportWorker:
                 'summary': {
                     'project_name': project.get('name', 'Unknown Project'),
                     'total_gaps': len(gaps),
-                    'critical_gaps': len([g for g in gaps if g.get('severity') == 'critical']),
+                    'critical_gaps': Counter(g.get('severity') for g in gaps)['critical'],
                     'draft_count': len(drafts),
                     'generated_at': datetime.now(timezone.utc).isoformat(),
                     'coverage_percentage': self._calculate_coverage_percentage(mappings, gaps)
@@ -740,9 +1401,9 @@ class ExportWorker:
 
             # Generate bundle based on format
             if request.format == 'json':
-                bundle_url = await self._create_json_bundle(bundle_data)
+                bundle_url = await self._create_json_bundle(bundle_data, request.project_id)
             elif request.format == 'pdf':
-                bundle_url = await self._create_pdf_bundle(bundle_data)
+                bundle_url = await self._create_pdf_bundle(bundle_data, request.project_id)
             else:
                 return ExportResult(
                     project_id=request.project_id,
@@ -770,46 +1431,36 @@ class ExportWorker:
                 request_id=request.request_id
             )
 
-    def _detect_platform(self, repo_url: str) -> str:
-        """Detect Git platform from repository URL"""
-        if 'github.com' in repo_url:
-            return 'github'
-        elif 'gitlab.com' in repo_url:
-            return 'gitlab'
-        else:
-            return 'github'  # Default
-
-    def _extract_repo_name(self, repo_url: str) -> str:
-        """Extract repository name from URL"""
-        # Remove .git suffix and extract owner/repo
-        clean_url = repo_url.replace('.git', '')
-        parts = clean_url.split('/')
-        if len(parts) >= 2:
-            return f"{parts[-2]}/{parts[-1]}"
-        return clean_url
+    def get_git_client(self, platform: str, token: str) -> GitPlatformClient:
+        """Get the pooled API client for a platform and token"""
+        key = (platform, token)
+        client = self._git_clients.get(key)
+        if client is None:
+            client = GitPlatformClient(
+                platform=platform,
+                token=token,
+                session=self.http,
+                host_limits=self._host_limits,
+                concurrency=self.config.get("git_concurrency", 4),
+                rps=self.config.get("git_rps", 1.0)
+            )
+            self._git_clients[key] = client
+        return client
 
     async def _create_documentation_files(self, repo_path: Path, drafts: List[Dict]) -> List[Path]:
         """Create or update documentation files"""
-        modified_files = []
+        contents = {repo_path / path: content for path, content in _draft_files(drafts).items()}
 
-        for draft in drafts:
-            try:
-                # Determine file path
-                doc_path = draft.get('doc_path', 'new-documentation.md')
-                file_path = repo_path / doc_path
-
-                # Ensure directory exists
-                file_path.parent.mkdir(parents=True, exist_ok=True)
-
-                # Write draft content
-                async with aiofiles.open(file_path, 'w', encoding='utf-8') as f:
-                    await f.write(draft.get('mdx_content', ''))
+        # Directories and files for the whole batch are one executor job
+        errors = await asyncio.to_thread(_write_drafts_batch, contents)
 
-                modified_files.append(file_path)
-                logger.info("Created documentation file", path=str(file_path))
-
-            except Exception as e:
-                logger.error("Failed to create documentation file", error=str(e))
+        modified_files = []
+        for file_path in contents:
+            if file_path in errors:
+                logger.error("Failed to create documentation file", path=str(file_path), error=str(errors[file_path]))
+                continue
+            modified_files.append(file_path)
+            logger.info("Created documentation file", path=str(file_path))
 
         return modified_files
 
@@ -817,15 +1468,8 @@ class ExportWorker:
         """Generate conventional commit message"""
         draft_count = len(drafts)
         gap_count = len(gaps)
-
-        if draft_count > 0 and gap_count > 0:
-            return f"docs: add {draft_count} documentation drafts addressing {gap_count} gaps"
-        elif draft_count > 0:
-            return f"docs: add {draft_count} documentation drafts"
-        elif gap_count > 0:
-            return f"docs: address {gap_count} documentation gaps"
-        else:
-            return "docs: update documentation"
+        message = _COMMIT_MESSAGES[(bool(draft_count) << 1) | bool(gap_count)]
+        return message.format(drafts=draft_count, gaps=gap_count)
 
     async def _create_pr_details(self, request: ExportRequest, drafts: List[Dict],
                                 gaps: List[Dict], changelog: Optional[str],
@@ -833,75 +1477,125 @@ class ExportWorker:
         """Create pull request details"""
         title = f"📝 Documentation Updates - {len(drafts)} drafts, {len(gaps)} gaps addressed"
 
-        body_lines = [
-            "## 📋 Summary",
-            f"- **Drafts Added:** {len(drafts)}",
-            f"- **Gaps Addressed:** {len(gaps)}",
-            f"- **Branch:** `{branch_name}`",
-            "",
-            "## 📝 Changes",
-        ]
-
-        # Add draft summaries
+        # Add draft summaries, limited to the first 5
+        draft_list = ""
         if drafts:
-            body_lines.append("### New Documentation:")
-            for draft in drafts[:5]:  # Limit to first 5
-                draft_title = draft.get('frontmatter', {}).get('title', 'Untitled')
-                body_lines.append(f"- {draft_title}")
+            draft_list = "\n### New Documentation:\n" + "\n".join(
+                f"- {draft.get('frontmatter', {}).get('title', 'Untitled')}" for draft in drafts[:5]
+            )
             if len(drafts) > 5:
-                body_lines.append(f"- ... and {len(drafts) - 5} more drafts")
-
-        # Add changelog if available
-        if changelog:
-            body_lines.extend([
-                "",
-                "## 📋 Detailed Changelog",
-                changelog
-            ])
-
-        body_lines.extend([
-            "",
-            "---",
-            "*This PR was automatically generated by AI Documentation Gap Finder*",
-            "*Please review all changes before merging*"
-        ])
+                draft_list += f"\n- ... and {len(drafts) - 5} more drafts"
+
+        body = _PR_BODY_TEMPLATE.substitute(
+            drafts_count=len(drafts),
+            gaps_count=len(gaps),
+            branch=branch_name,
+            draft_list=draft_list,
+            changelog_section=f"\n\n## 📋 Detailed Changelog\n{changelog}" if changelog else "",
+        )
 
         return PRDetails(
             title=title,
-            body="\n".join(body_lines),
+            body=body,
             branch_name=branch_name,
             base_branch="main",
             labels=["documentation", "auto-generated"],
             reviewers=[]  # Could be populated from CODEOWNERS
         )
 
-    async def _create_json_bundle(self, data: Dict) -> Optional[str]:
+    async def _create_json_bundle(self, data: Dict, project_id: str) -> Optional[str]:
         """Create JSON bundle and return URL"""
         try:
-            bundle_filename = f"docgap-report-{int(time.time())}.json"
-            bundle_path = self.workspace_dir / bundle_filename
+            bundle_filename = _bundle_filename(project_id, "json.zst")
 
-            async with aiofiles.open(bundle_path, 'w', encoding='utf-8') as f:
-                await f.write(json.dumps(data, indent=2, default=str))
+            # Bundles are large and highly redundant; zstd compresses them on all cores
+            compressed = await asyncio.to_thread(_encode_bundle, data)
 
-            # In a real implementation, upload to S3/Minio and return URL
-            return f"file://{bundle_path}"
+            return await self._publish_bundle(bundle_filename, compressed, 'application/json',
+                                              content_encoding='zstd')
 
         except Exception as e:
             logger.error("Failed to create JSON bundle", error=str(e))
             return None
 
-    async def _create_pdf_bundle(self, data: Dict) -> Optional[str]:
+    async def _publish_bundle(self, bundle_filename: str, payload: bytes, content_type: str,
+                              content_encoding: Optional[str] = None) -> str:
+        """Upload a bundle to object storage and return a presigned URL"""
+        if not self.s3_client:
+            bundle_path = self.workspace_dir / bundle_filename
+            await asyncio.to_thread(bundle_path.write_bytes, payload)
+            return f"file://{bundle_path}"
+
+        # Uploaded straight from memory; nothing touches the workspace disk
+        bucket = self.config["bundle_bucket"]
+        key = f"bundles/{bundle_filename}"
+        started = time.perf_counter()
+        headers = {'ContentType': content_type}
+        if content_encoding:
+            headers['ContentEncoding'] = content_encoding
+
+        if len(payload) <= _S3_PART_SIZE:
+            await self.s3_client.put_object(Bucket=bucket, Key=key, Body=payload, **headers)
+        else:
+            await self._multipart_upload(payload, bucket, key, headers)
+
+        logger.info("Uploaded bundle", key=key, size=len(payload),
+                    duration=round(time.perf_counter() - started, 3))
+
+        return await self.s3_client.generate_presigned_url(
+            'get_object',
+            Params={'Bucket': bucket, 'Key': key},
+            ExpiresIn=self.config.get("bundle_url_ttl", 7 * 24 * 3600)
+        )
+
+    async def _multipart_upload(self, payload: bytes, bucket: str, key: str, headers: Dict[str, str]):
+        """Upload a large payload as concurrent multipart parts"""
+        upload = await self.s3_client.create_multipart_upload(Bucket=bucket, Key=key, **headers)
+        upload_id = upload['UploadId']
+        view = memoryview(payload)
+        # Bounds the number of part requests in flight
+        part_sem = asyncio.Semaphore(self.config.get("s3_part_concurrency", 4))
+
+        async def upload_part(number: int, offset: int) -> Dict[str, Any]:
+            async with part_sem:
+                part = await self.s3_client.upload_part(
+                    Bucket=bucket, Key=key, UploadId=upload_id, PartNumber=number,
+                    Body=bytes(view[offset:offset + _S3_PART_SIZE])
+                )
+            return {'PartNumber': number, 'ETag': part['ETag']}
+
+        try:
+            parts = await asyncio.gather(*(
+                upload_part(number, offset)
+                for number, offset in enumerate(range(0, len(payload), _S3_PART_SIZE), 1)
+            ))
+            await self.s3_client.complete_multipart_upload(
+                Bucket=bucket, Key=key, UploadId=upload_id, MultipartUpload={'Parts': parts}
+            )
+        except Exception:
+            await self.s3_client.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+            raise
+
+    async def _render_pdf(self, data: Dict) -> Optional[bytes]:
+        """Render a PDF report off the event loop, in the process pool when one is configured"""
+        if not self.pdf_pool:
+            return await asyncio.to_thread(render_pdf, data)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.pdf_pool, render_pdf, data)
+
+    async def _create_pdf_bundle(self, data: Dict, project_id: str) -> Optional[str]:
         """Create PDF bundle and return URL"""
         try:
-            bundle_filename = f"docgap-report-{int(time.time())}.pdf"
-            bundle_path = self.workspace_dir / bundle_filename
+            bundle_filename = _bundle_filename(project_id, "pdf")
 
-            success = self.pdf_generator.generate_pdf_report(data, bundle_path)
+            async with self._pdf_sem:
+                started = time.perf_counter()
+                pdf = await self._render_pdf(data)
+            logger.info("Rendered PDF report", bundle=bundle_filename,
+                        duration=round(time.perf_counter() - started, 3))
 
-            if success:
-                # In a real implementation, upload to S3/Minio and return URL
-                return f"file://{bundle_path}"
+            if pdf is not None:
+                return await self._publish_bundle(bundle_filename, pdf, 'application/pdf')
             else:
                 return None
 
@@ -914,13 +1608,18 @@ class ExportWorker:
         if not mappings and not gaps:
             return 0.0
 
-        total_entities = len(set(m['entity_id'] for m in mappings))
-        documented_entities = len(set(m['entity_id'] for m in mappings if m.get('score', 0) > 0.5))
+        total_entities: Set[str] = set()
+        documented_entities: Set[str] = set()
+        for mapping in mappings:
+            entity_id = mapping['entity_id']
+            total_entities.add(entity_id)
+            if mapping.get('score', 0) > 0.5:
+                documented_entities.add(entity_id)
 
-        if total_entities == 0:
+        if not total_entities:
             return 0.0
 
-        return round((documented_entities / total_entities) * 100, 1)
+        return round((len(documented_entities) / len(total_entities)) * 100, 1)
 
     def _generate_recommendations(self, gaps: List[Dict], scores: List[Dict]) -> List[str]:
         """Generate recommendations based on analysis"""
@@ -946,8 +1645,99 @@ class ExportWorker:
 
         return recommendations
 
-    # Mock data methods (replace with actual database queries)
+    def _lookup_cache_keys(self, project_id: str) -> List[str]:
+        """Redis keys of a project's cached lookups"""
+        return [f"export:{kind}:{project_id}" for kind in ('project', 'mappings', 'scores')]
+
+    async def _cached(self, key: str, ttl: int, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Return a cached lookup, loading and storing it on a miss"""
+        try:
+            cached = await self.redis_client.get(key)
+            if cached:
+                return orjson.loads(cached)
+        except redis.RedisError as e:
+            logger.warning("Lookup cache read failed", key=key, error=str(e))
+
+        value = await loader()
+
+        try:
+            await self.redis_client.setex(key, ttl, orjson.dumps(value, default=str))
+        except redis.RedisError as e:
+            logger.warning("Lookup cache write failed", key=key, error=str(e))
+        return value
+
+    async def _cached_many(self, kind: str, ids: List[str], ttl: int,
+                           loader: Callable[[List[str]], Awaitable[List[Dict]]]) -> List[Dict]:
+        """Per-id cached lookups: one MGET, and the loader only sees the misses"""
+        if not ids:
+            return []
+        keys = [f"export:{kind}:{item_id}" for item_id in ids]
+        try:
+            cached = await self.redis_client.mget(keys)
+        except redis.RedisError as e:
+            logger.warning("Lookup cache read failed", kind=kind, error=str(e))
+            cached = [None] * len(ids)
+
+        missing = list(dict.fromkeys(item_id for item_id, value in zip(ids, cached) if value is None))
+        loaded: Dict[str, Dict] = {}
+        if missing:
+            loaded = {item['id']: item for item in await loader(missing)}
+            try:
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    for item_id, item in loaded.items():
+                        pipe.setex(f"export:{kind}:{item_id}", ttl, orjson.dumps(item, default=str))
+                    await pipe.execute()
+            except redis.RedisError as e:
+                logger.warning("Lookup cache write failed", kind=kind, error=str(e))
+
+        results = []
+        for item_id, value in zip(ids, cached):
+            if value is not None:
+                results.append(orjson.loads(value))
+            elif item_id in loaded:
+                results.append(loaded[item_id])
+        return results
+
+    async def handle_cache_invalidation(self, msg):
+        """Forget cached lookups after the underlying project, draft or gap data was written"""
+        try:
+            data = orjson.loads(msg.data)
+            keys = []
+            if data.get('project_id'):
+                keys.extend(self._lookup_cache_keys(data['project_id']))
+            for kind in ('draft', 'gap'):
+                ids = data.get(f'{kind}_ids') or ([data[f'{kind}_id']] if data.get(f'{kind}_id') else [])
+                keys.extend(f"export:{kind}:{item_id}" for item_id in ids)
+            if keys:
+                await self.redis_client.delete(*keys)
+        except Exception as e:
+            logger.warning("Failed to invalidate lookup cache", error=str(e))
+
     async def _get_drafts_data(self, draft_ids: List[str]) -> List[Dict]:
+        """Drafts by id, cached per draft"""
+        return await self._cached_many('draft', draft_ids, self.lookup_ttl, self._fetch_drafts_data)
+
+    async def _get_gaps_data(self, gap_ids: List[str]) -> List[Dict]:
+        """Gaps by id, cached per gap"""
+        return await self._cached_many('gap', gap_ids, self.lookup_ttl, self._fetch_gaps_data)
+
+    async def _get_mappings_data(self, project_id: str) -> List[Dict]:
+        """Mappings for a project, cached briefly"""
+        return await self._cached(f"export:mappings:{project_id}", self.lookup_ttl,
+                                  lambda: self._fetch_mappings_data(project_id))
+
+    async def _get_scores_data(self, project_id: str) -> List[Dict]:
+        """Scores for a project, cached briefly"""
+        return await self._cached(f"export:scores:{project_id}", self.lookup_ttl,
+                                  lambda: self._fetch_scores_data(project_id))
+
+    async def _get_project_data(self, project_id: str) -> Dict:
+        """Project record, cached briefly"""
+        return await self._cached(f"export:project:{project_id}", self.lookup_ttl,
+                                  lambda: self._fetch_project_data(project_id))
+
+    # Mock data methods (replace with actual database queries)
+    async def _fetch_drafts_data(self, draft_ids: List[str]) -> List[Dict]:
         """Mock draft data"""
         return [
             {
@@ -959,7 +1749,7 @@ class ExportWorker:
             } for draft_id in draft_ids
         ]
 
-    async def _get_gaps_data(self, gap_ids: List[str]) -> List[Dict]:
+    async def _fetch_gaps_data(self, gap_ids: List[str]) -> List[Dict]:
         """Mock gaps data"""
         return [
             {
@@ -971,20 +1761,31 @@ class ExportWorker:
             } for gap_id in gap_ids
         ]
 
-    async def _get_mappings_data(self, project_id: str) -> List[Dict]:
+    async def _fetch_mappings_data(self, project_id: str) -> List[Dict]:
         """Mock mappings data"""
         return [{'entity_id': 'entity_1', 'doc_id': 'doc_1', 'score': 0.8}]
 
-    async def _get_scores_data(self, project_id: str) -> List[Dict]:
+    async def _fetch_scores_data(self, project_id: str) -> List[Dict]:
         """Mock scores data"""
         return [{'doc_path': 'docs/api.md', 'overall_score': 0.75}]
 
-    async def _get_project_data(self, project_id: str) -> Dict:
+    async def _fetch_project_data(self, project_id: str) -> Dict:
         """Mock project data"""
         return {'id': project_id, 'name': 'Sample Project'}
 
     async def shutdown(self):
         """Clean shutdown"""
+        if self._reaper:
+            self._reaper.cancel()
+            await asyncio.gather(self._reaper, return_exceptions=True)
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        for client in self._git_clients.values():
+            await client.close()
+        await self.http.aclose()
+        if self.pdf_pool:
+            self.pdf_pool.shutdown()
+        await self._exit_stack.aclose()
         if self.nats_client:
             await self.nats_client.close()
         if self.redis_client:
@@ -999,15 +1800,36 @@ async def main():
         "nats_url": os.getenv("NATS_URL", "nats://localhost:4222"),
         "workspace_dir": os.getenv("EXPORT_WORKSPACE_DIR", "/tmp/ai-docgap/exports"),
         "git_token": os.getenv("GIT_TOKEN", ""),
+        "git_concurrency": int(os.getenv("GIT_CONCURRENCY", "4")),
+        "git_rps": float(os.getenv("GIT_RPS", "1.0")),
+        "max_concurrent_exports": int(os.getenv("MAX_CONCURRENT_EXPORTS", "8")),
+        "lookup_cache_ttl": int(os.getenv("LOOKUP_CACHE_TTL", "300")),
+        "inflight_ttl": int(os.getenv("EXPORT_INFLIGHT_TTL", "3600")),
+        "pdf_workers": int(os.getenv("PDF_WORKERS", str(os.cpu_count() or 1))),
+        "pdf_concurrency": int(os.getenv("PDF_CONCURRENCY", "2")),
+        "bundle_bucket": os.getenv("EXPORT_BUCKET", ""),
+        "s3_endpoint": os.getenv("MINIO_ENDPOINT", ""),
+        "s3_access_key": os.getenv("MINIO_ACCESS_KEY", ""),
+        "s3_secret_key": os.getenv("MINIO_SECRET_KEY", ""),
+        "s3_region": os.getenv("S3_REGION", "us-east-1"),
+        "s3_part_concurrency": int(os.getenv("S3_PART_CONCURRENCY", "4")),
+        "s3_max_pool_connections": int(os.getenv("S3_MAX_POOL_CONNECTIONS", "32")),
+        "bundle_url_ttl": int(os.getenv("BUNDLE_URL_TTL", str(7 * 24 * 3600))),
     }
 
     worker = ExportWorker(config)
 
+    failed = False
     try:
         await worker.run()
     except Exception as e:
         logger.error("Worker failed", error=str(e))
+        failed = True
+    finally:
+        # In-flight exports finish and clients close on every exit path
         await worker.shutdown()
+
+    if failed:
         sys.exit(1)
 
 
@@ -0,0 +1,293 @@
+# Export Worker Tests
+
+import asyncio
+import json
+import socket
+import subprocess
+import tempfile
+import shutil
+import time
+from pathlib import Path
+import httpx
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from nats.errors import NotJSMessageError
+
+from main import (
+    BranchManager, ExportRequest, ExportWorker, ExportResult, GitPlatformClient, PRDetails,
+    _INFLIGHT_KEY_PREFIX, _INFLIGHT_SET, _S3_PART_SIZE,
+)
+
+
+class TestInflightRequests:
+    """Claim, ack and reap flow for export requests"""
+
+    @pytest.fixture
+    def temp_workspace(self):
+        """Create temporary workspace for testing"""
+        temp_dir = Path(tempfile.mkdtemp())
+        yield temp_dir
+        shutil.rmtree(temp_dir)
+
+    @pytest.fixture
+    def worker(self, temp_workspace):
+        """ExportWorker with mocked Redis and NATS clients"""
+        worker = ExportWorker({"workspace_dir": str(temp_workspace), "inflight_ttl": 60})
+        worker.redis_client = AsyncMock()
+        worker.redis_client.set.return_value = True
+        worker.nats_client = AsyncMock()
+        worker._handle_bundle_export = AsyncMock(return_value=ExportResult(
+            project_id="p", export_type="bundle", success=True, request_id="r1"
+        ))
+        return worker
+
+    @staticmethod
+    def _message(reply: str):
+        msg = MagicMock()
+        msg.data = json.dumps({
+            "project_id": "p", "export_type": "bundle", "target_repo": "", "request_id": "r1"
+        }).encode()
+        msg.reply = reply
+        msg.ack = AsyncMock(side_effect=NotJSMessageError if not reply else None)
+        return msg
+
+    @pytest.mark.asyncio
+    async def test_core_nats_request_runs_without_ack(self, worker):
+        """A delivery without a reply subject (e.g. a reaper replay) is still exported"""
+        msg = self._message(reply="")
+
+        await worker.handle_export_request(msg)
+
+        msg.ack.assert_not_awaited()
+        worker._handle_bundle_export.assert_awaited_once()
+        subject, payload = worker.nats_client.publish.call_args.args
+        assert subject == "docs.export.result"
+        assert json.loads(payload)["success"] is True
+        worker.redis_client.delete.assert_awaited_with(f"{_INFLIGHT_KEY_PREFIX}r1")
+
+    @pytest.mark.asyncio
+    async def test_request_is_acked_after_claim(self, worker):
+        """Deliveries with a reply subject are acked once the sentinel is claimed"""
+        msg = self._message(reply="_INBOX.1")
+
+        await worker.handle_export_request(msg)
+
+        msg.ack.assert_awaited_once()
+        worker.redis_client.set.assert_awaited_once()
+        assert worker.redis_client.set.call_args.kwargs["nx"] is True
+        worker._handle_bundle_export.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_duplicate_request_is_skipped(self, worker):
+        """A request already in flight is acked but not exported again"""
+        worker.redis_client.set.return_value = None
+        msg = self._message(reply="_INBOX.1")
+
+        await worker.handle_export_request(msg)
+
+        msg.ack.assert_awaited_once()
+        worker._handle_bundle_export.assert_not_awaited()
+        worker.redis_client.delete.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_reaper_republishes_stalled_requests(self, worker):
+        """Stale sentinels are taken once and their payload republished"""
+        payload = '{"project_id": "p", "export_type": "bundle", "target_repo": ""}'
+        worker.redis_client.zrangebyscore.return_value = ["r1", "r2"]
+        worker.redis_client.getdel.side_effect = [payload, None]
+
+        republished = await worker._reap_stale_inflight()
+
+        assert republished == 1
+        _, _, cutoff = worker.redis_client.zrangebyscore.call_args.args
+        assert cutoff <= time.time() - worker.inflight_ttl
+        worker.redis_client.zrem.assert_any_await(_INFLIGHT_SET, "r1")
+        worker.redis_client.zrem.assert_any_await(_INFLIGHT_SET, "r2")
+        worker.nats_client.publish.assert_awaited_once_with("docs.export", payload.encode())
+
+
+    @pytest.mark.asyncio
+    async def test_run_returns_on_stop(self, worker):
+        """run() exits once stop() is called instead of sleeping forever"""
+        worker.initialize = AsyncMock()
+
+        task = asyncio.create_task(worker.run())
+        await asyncio.sleep(0.1)
+        worker.stop()
+        await asyncio.wait_for(task, timeout=5)
+
+        assert worker.nats_client.subscribe.await_count == 3
+        await worker.shutdown()
+        assert worker._reaper.cancelled()
+
+
+class TestBranchManager:
+    """Branch setup on cached partial clones"""
+
+    @pytest.fixture
+    def temp_workspace(self):
+        """Create temporary workspace for testing"""
+        temp_dir = Path(tempfile.mkdtemp())
+        yield temp_dir
+        shutil.rmtree(temp_dir)
+
+    @staticmethod
+    def _make_remote(root: Path, owner: str) -> str:
+        remote = root / owner / "docs.git"
+        seed = root / f"seed-{owner}"
+        subprocess.run(["git", "init", "-q", "--bare", "-b", "main", str(remote)], check=True)
+        subprocess.run(["git", "clone", "-q", str(remote), str(seed)], check=True)
+        (seed / "README").write_text(owner)
+        subprocess.run(["git", "add", "README"], cwd=seed, check=True)
+        subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "init"],
+                       cwd=seed, check=True)
+        subprocess.run(["git", "push", "-q", "origin", "main"], cwd=seed, check=True)
+        return f"file://{remote}"
+
+    @pytest.mark.asyncio
+    async def test_same_named_repos_keep_separate_clones(self, temp_workspace):
+        """owner-a/docs and owner-b/docs never share or clobber a clone store"""
+        url_a = self._make_remote(temp_workspace / "remotes", "owner-a")
+        url_b = self._make_remote(temp_workspace / "remotes", "owner-b")
+        manager = BranchManager(temp_workspace / "ws")
+
+        path_a, created_a = await manager.setup_branch(url_a, "docs/a")
+        path_b, created_b = await manager.setup_branch(url_b, "docs/b")
+        path_a2, created_a2 = await manager.setup_branch(url_a, "docs/a2")
+
+        assert created_a and created_b and created_a2
+        assert (path_a / "README").read_text() == "owner-a"
+        assert (path_b / "README").read_text() == "owner-b"
+        assert (path_a2 / "README").read_text() == "owner-a"
+        assert len(list((temp_workspace / "ws" / "repos").iterdir())) == 2
+
+
+class TestGitPlatformClient:
+    """GitHub API paths of GitPlatformClient"""
+
+    @staticmethod
+    def _client(pulls_status: int):
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append((request.method, request.url.path))
+            if request.method == "DELETE":
+                return httpx.Response(204)
+            if request.url.path.endswith("/pulls"):
+                return httpx.Response(pulls_status, json={"html_url": "https://github.com/o/r/pull/1"})
+            if "repository(" in json.loads(request.content)["query"]:
+                return httpx.Response(200, json={"data": {"repository": {"id": "R_1"}}})
+            # createRef went through, createPullRequest did not
+            return httpx.Response(200, json={
+                "data": {"createRef": {"ref": {"id": "REF_1"}}, "createPullRequest": None},
+                "errors": [{"message": "pull request failed"}],
+            })
+
+        session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return GitPlatformClient("github", "token", session=session, rps=100), calls
+
+    @staticmethod
+    def _pr_details() -> PRDetails:
+        return PRDetails(title="t", body="b", branch_name="docs/x", base_branch="main",
+                         labels=[], reviewers=[])
+
+    @pytest.mark.asyncio
+    async def test_partial_graphql_failure_falls_back_to_rest(self):
+        """A created ref without a PR is finished with REST POST /pulls"""
+        client, calls = self._client(pulls_status=201)
+
+        pr_url = await client.create_pr_graphql("o/r", self._pr_details(), "abc")
+
+        assert pr_url == "https://github.com/o/r/pull/1"
+        assert ("POST", "/repos/o/r/pulls") in calls
+        assert not any(method == "DELETE" for method, _ in calls)
+
+    @pytest.mark.asyncio
+    async def test_partial_graphql_failure_deletes_orphan_ref(self):
+        """If the REST fallback fails too, the new branch is removed"""
+        client, calls = self._client(pulls_status=422)
+
+        pr_url = await client.create_pr_graphql("o/r", self._pr_details(), "abc")
+
+        assert pr_url is None
+        assert calls[-1] == ("DELETE", "/repos/o/r/git/refs/heads/docs/x")
+
+
+class TestBundleUpload:
+    """Bundle upload to S3-compatible storage (moto stands in for MinIO)"""
+
+    @pytest.fixture
+    def s3_endpoint(self):
+        """Local moto S3 server"""
+        moto_server = pytest.importorskip("moto.server")
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        server = moto_server.ThreadedMotoServer(ip_address="127.0.0.1", port=port)
+        server.start()
+        yield f"127.0.0.1:{port}"
+        server.stop()
+
+    @pytest.mark.asyncio
+    async def test_small_and_multipart_uploads(self, s3_endpoint, tmp_path):
+        """Small bundles use one PUT, large ones a multipart upload; both get presigned URLs"""
+        worker = ExportWorker({
+            "workspace_dir": str(tmp_path), "bundle_bucket": "exports",
+            "s3_endpoint": s3_endpoint, "s3_access_key": "test", "s3_secret_key": "test",
+        })
+        await worker._init_object_storage()
+        try:
+            large = b"x" * (_S3_PART_SIZE * 2 + 1)
+            small_url = await worker._publish_bundle("small.json", b"{}", "application/json")
+            large_url = await worker._publish_bundle("large.pdf", large, "application/pdf")
+
+            assert "bundles/small.json" in small_url and "Signature" in small_url
+            assert "bundles/large.pdf" in large_url
+            head = await worker.s3_client.head_object(Bucket="exports", Key="bundles/large.pdf")
+            assert head["ContentLength"] == len(large)
+            assert not list(tmp_path.iterdir())
+        finally:
+            await worker._exit_stack.aclose()
+
+
+class TestDraftPaths:
+    """Draft doc paths must stay inside the target repository"""
+
+    _DRAFTS = [
+        {"doc_path": "docs/ok.md", "mdx_content": "ok"},
+        {"doc_path": "../../outside.md", "mdx_content": "evil"},
+        {"doc_path": "docs/../../../outside.md", "mdx_content": "evil"},
+        {"doc_path": ".git/hooks/post-checkout", "mdx_content": "evil"},
+        {"doc_path": "/docs/abs.md", "mdx_content": "abs"},
+    ]
+
+    @pytest.mark.asyncio
+    async def test_api_commit_rejects_traversal(self, tmp_path):
+        """Escaping paths never reach the tree entries of an API commit"""
+        worker = ExportWorker({"workspace_dir": str(tmp_path)})
+        client = MagicMock()
+        client.get_branch_head = AsyncMock(return_value=("base", "tree"))
+        client.commit_files_via_api = AsyncMock(return_value="commit")
+        client.create_pr_graphql = AsyncMock(return_value="https://github.com/o/r/pull/1")
+        worker.get_git_client = MagicMock(return_value=client)
+        request = ExportRequest(project_id="p", export_type="pr", target_repo="https://github.com/o/r.git")
+
+        result = await worker._handle_api_pr_export(request, self._DRAFTS, [], None, "docs/branch")
+
+        assert result.success
+        files = client.commit_files_via_api.call_args.args[3]
+        assert files == {"docs/ok.md": "ok", "docs/abs.md": "abs"}
+
+    @pytest.mark.asyncio
+    async def test_worktree_write_rejects_traversal(self, tmp_path):
+        """Escaping paths are not written next to or outside the worktree"""
+        worker = ExportWorker({"workspace_dir": str(tmp_path / "ws")})
+        repo_path = tmp_path / "repo"
+        repo_path.mkdir()
+
+        written = await worker._create_documentation_files(repo_path, self._DRAFTS)
+
+        assert sorted(written) == [repo_path / "docs" / "abs.md", repo_path / "docs" / "ok.md"]
+        assert not (tmp_path / "outside.md").exists()
+        assert not (repo_path / ".git").exists()